@@ -0,0 +1,143 @@
+"""Lookup benchmark for the company knowledge base (company_index.py).
+
+Generates a synthetic dataset of --companies rows, then measures:
+- build_seconds: initial load + index build
+- lookup latency p50/p95/p99 over --lookups random industry/role/location/size queries
+- incremental_reload_seconds: reload after editing --changed rows in place
+- lookup_during_reload_max_ms: slowest lookup while that reload runs on another thread
+- full_rebuild_seconds: building a fresh index from the same file, for comparison
+
+Usage: python -m benchmarks.companies [--companies 50000] [--lookups 5000] [--changed 100] [--output results.json]
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from benchmarks.offline import percentile
+from company_index import CompanyIndex
+
+INDUSTRIES = ["Technology", "Finance", "Healthcare", "AI", "Retail", "Energy", "Media", "Education", "Logistics", "Gaming"]
+SIZES = ["Small", "Small-Medium", "Medium", "Large"]
+LOCATIONS = ["London", "New York", "San Francisco", "Bangalore", "Berlin", "Singapore", "Toronto", "Sydney", "Paris", "Austin"]
+ROLES = [
+    "Software Engineers", "Data Scientists", "Product Managers", "Machine Learning Engineers", "Site Reliability Engineers",
+    "Designers", "Solutions Architects", "Research Scientists", "Developer Advocates", "Data Engineers", "Founders",
+]
+POTENTIALS = ["High", "Medium", "Low"]
+QUERY_ROLES = ["Software Engineer", "Data Scientist", "Machine Learning Engineer", "Product Manager", "Founder", "Architect"]
+
+
+def write_dataset(path: str, companies: int, rng: random.Random):
+    with open(path, "w", newline="", encoding="utf-8") as data_file:
+        writer = csv.writer(data_file)
+        writer.writerow(["name", "industry", "size", "location", "employees", "networking_potential", "key_people", "content_strategy"])
+        for i in range(companies):
+            writer.writerow([
+                f"Company {i}",
+                rng.choice(INDUSTRIES),
+                rng.choice(SIZES),
+                "; ".join(rng.sample(LOCATIONS, rng.randint(1, 3))),
+                rng.randint(10, 200000),
+                rng.choice(POTENTIALS),
+                "; ".join(rng.sample(ROLES, 3)),
+                "Share engineering insights",
+            ])
+
+
+def edit_rows(path: str, changed: int, rng: random.Random):
+    with open(path, newline="", encoding="utf-8") as data_file:
+        rows = list(csv.reader(data_file))
+    for row in rng.sample(rows[1:], changed):
+        row[5] = rng.choice(POTENTIALS)
+        row[6] = "; ".join(rng.sample(ROLES, 3))
+    with open(path, "w", newline="", encoding="utf-8") as data_file:
+        csv.writer(data_file).writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--companies", type=int, default=50000, help="rows in the synthetic dataset")
+    parser.add_argument("--lookups", type=int, default=5000, help="random lookups to time")
+    parser.add_argument("--changed", type=int, default=100, help="rows edited before the incremental reload")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "companies.csv")
+        write_dataset(path, args.companies, rng)
+
+        start = time.perf_counter()
+        index = CompanyIndex(path, check_interval=3600)
+        build_seconds = time.perf_counter() - start
+
+        queries = [
+            {
+                "industry": rng.choice(INDUSTRIES),
+                "role": rng.choice(QUERY_ROLES),
+                "location": rng.choice(LOCATIONS + ["Global"]),
+                "size": rng.choice(SIZES + [None]),
+            }
+            for _ in range(args.lookups)
+        ]
+        latencies = []
+        for query in queries:
+            lookup_start = time.perf_counter()
+            index.search(**query)
+            latencies.append(time.perf_counter() - lookup_start)
+
+        edit_rows(path, args.changed, rng)
+        reload_result = {}
+
+        def timed_reload():
+            reload_start = time.perf_counter()
+            reload_result["changes"] = index.reload()
+            reload_result["seconds"] = time.perf_counter() - reload_start
+
+        reloader = threading.Thread(target=timed_reload)
+        reloader.start()
+        during_reload = []
+        while reloader.is_alive():
+            lookup_start = time.perf_counter()
+            index.search(**rng.choice(queries))
+            during_reload.append(time.perf_counter() - lookup_start)
+        reloader.join()
+        changes, incremental_seconds = reload_result["changes"], reload_result["seconds"]
+
+        start = time.perf_counter()
+        CompanyIndex(path)
+        rebuild_seconds = time.perf_counter() - start
+
+    results = {
+        "companies": args.companies,
+        "lookups": args.lookups,
+        "build_seconds": round(build_seconds, 3),
+        "lookup_p50_ms": round(statistics.median(latencies) * 1000, 4),
+        "lookup_p95_ms": round(percentile(latencies, 0.95) * 1000, 4),
+        "lookup_p99_ms": round(percentile(latencies, 0.99) * 1000, 4),
+        "incremental_reload_seconds": round(incremental_seconds, 3),
+        "incremental_changes": changes,
+        "lookup_during_reload_max_ms": round(max(during_reload, default=0.0) * 1000, 4),
+        "full_rebuild_seconds": round(rebuild_seconds, 3),
+    }
+    print(f"🏢 {args.companies} companies indexed in {results['build_seconds']}s")
+    print(f"🔎 lookup p50 {results['lookup_p50_ms']}ms  p95 {results['lookup_p95_ms']}ms  p99 {results['lookup_p99_ms']}ms")
+    print(
+        f"♻️ reload after {args.changed} edits: {results['incremental_reload_seconds']}s "
+        f"(full rebuild {results['full_rebuild_seconds']}s), "
+        f"slowest lookup meanwhile {results['lookup_during_reload_max_ms']}ms"
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Side-by-side latency and token comparison: coordinate-mode team vs staged pipeline.
+
+Both engines generate the same post (team.EXAMPLE_USER_INPUT by default) with
+fresh agents on every repetition. Needs GOOGLE_API_KEY unless --offline is
+given, which swaps in the stub model and search backend from stubs.py.
+
+With --variants N it also compares N separate coordinate-mode runs against one
+StagedPipeline.variants call producing N variants from a shared research pass.
+
+Usage: python -m benchmarks.engines [--repeat 3] [--variants 3] [--offline] [--input user_input.json] [--output results.json]
+"""
+import argparse
+import json
+import statistics
+import time
+
+from benchmarks.stubs import install_stubs
+from pipeline import StagedPipeline, summarize_usage
+from team import EXAMPLE_USER_INPUT, LinkedInContentCreator, create_linkedin_content_team
+
+
+def run_coordinate(user_input: dict) -> dict:
+    creator = LinkedInContentCreator(team=create_linkedin_content_team(), use_cache=False)
+    start = time.perf_counter()
+    response = creator.create_networking_content(user_input)
+    return {"seconds": time.perf_counter() - start, **summarize_usage(response)}
+
+
+def run_staged(user_input: dict) -> dict:
+    staged = StagedPipeline()
+    start = time.perf_counter()
+    result = staged.run(user_input)
+    return {"seconds": time.perf_counter() - start, **result.usage}
+
+
+def run_coordinate_variants(user_input: dict, count: int) -> dict:
+    runs = [run_coordinate(user_input) for _ in range(count)]
+    return {metric: sum(run[metric] for run in runs) for metric in runs[0]}
+
+
+def run_variants(user_input: dict, count: int) -> dict:
+    staged = StagedPipeline(include_publisher=False)
+    start = time.perf_counter()
+    result = staged.variants(user_input, count)
+    return {"seconds": time.perf_counter() - start, **result.usage}
+
+
+def print_comparison(title: str, before_label: str, after_label: str, before: dict, after: dict):
+    print(f"{title:<18}{before_label:>12}{after_label:>12}{'change':>10}")
+    for metric in before:
+        change = f"{(after[metric] - before[metric]) / before[metric]:+.0%}" if before[metric] else "n/a"
+        print(f"{metric:<18}{before[metric]:>12}{after[metric]:>12}{change:>10}")
+
+
+def summarize(samples: list) -> dict:
+    return {metric: round(statistics.median(sample[metric] for sample in samples), 3) for metric in samples[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per engine")
+    parser.add_argument("--variants", type=int, default=0, help="also compare N separate runs with N variants of one run")
+    parser.add_argument("--offline", action="store_true", help="use the stub model and search backend")
+    parser.add_argument("--input", help="JSON file with a single user input")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    if args.offline:
+        install_stubs()
+    user_input = EXAMPLE_USER_INPUT
+    if args.input:
+        with open(args.input, encoding="utf-8") as input_file:
+            user_input = json.load(input_file)
+
+    results = {
+        "coordinate": summarize([run_coordinate(user_input) for _ in range(args.repeat)]),
+        "staged": summarize([run_staged(user_input) for _ in range(args.repeat)]),
+    }
+
+    print_comparison("metric (median)", "coordinate", "staged", results["coordinate"], results["staged"])
+    if args.variants:
+        results[f"coordinate_x{args.variants}"] = summarize(
+            [run_coordinate_variants(user_input, args.variants) for _ in range(args.repeat)]
+        )
+        results[f"variants_x{args.variants}"] = summarize([run_variants(user_input, args.variants) for _ in range(args.repeat)])
+        print()
+        print_comparison(
+            f"{args.variants} posts (median)", "separate", "variants",
+            results[f"coordinate_x{args.variants}"], results[f"variants_x{args.variants}"],
+        )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump({"repeat": args.repeat, **results}, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""Offline benchmark suite for LinkedInContentCreator.
+
+Runs the real team code against StubGemini and FakeDDGS (see stubs.py), so
+results depend only on the orchestration code and the configured stub
+latencies, not on Gemini quota or the network. Scenarios:
+
+- single:     sequential create_networking_content calls on one creator
+- batch:      run_batch over a generated JSONL file
+- concurrent: independent creators running acreate_networking_content at once
+
+Each scenario runs in its own interpreter, so its peak RSS (the process
+high-water mark; tracemalloc was avoided because it more than doubles run
+time) belongs to that scenario alone. For each scenario it reports
+throughput, p50/p95 latency, peak RSS, and model round trips and tokens per
+post. The results can be saved as JSON and compared across commits.
+
+Usage: python -m benchmarks.offline [--posts 20] [--concurrency 4] [--model-latency 0.05] [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+import resource
+import sys
+
+from benchmarks.stubs import FakeDDGS, install_stubs
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def scenario_result(latencies, elapsed: float, runs: list, posts: int) -> dict:
+    return {
+        "posts": posts,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_posts_per_second": round(posts / elapsed, 3) if elapsed else None,
+        "latency_p50_seconds": round(statistics.median(latencies), 4),
+        "latency_p95_seconds": round(percentile(latencies, 0.95), 4),
+        "peak_rss_mb": peak_rss_mb(),
+        "model_round_trips_per_post": round(sum(m.model_calls for m in runs) / len(runs), 2) if runs else None,
+        "input_tokens_per_post": round(sum(m.input_tokens for m in runs) / len(runs), 1) if runs else None,
+        "search_requests": FakeDDGS.calls,
+    }
+
+
+class RunLog:
+    """Collects every RunMetrics recorded through the shared registry."""
+
+    def __init__(self):
+        import team
+
+        self.runs = []
+        registry = team.get_metrics_registry()
+        original_record = registry.record
+
+        def record(metrics):
+            self.runs.append(metrics)
+            original_record(metrics)
+
+        registry.record = record
+
+
+def run_single(posts: int, log: RunLog) -> dict:
+    import team
+
+    creator = team.LinkedInContentCreator(team=team.create_linkedin_content_team(), use_cache=False)
+    runs_before, latencies = len(log.runs), []
+    start = time.perf_counter()
+    for _ in range(posts):
+        item_start = time.perf_counter()
+        creator.create_networking_content(team.EXAMPLE_USER_INPUT)
+        latencies.append(time.perf_counter() - item_start)
+    elapsed = time.perf_counter() - start
+    return scenario_result(latencies, elapsed, log.runs[runs_before:], posts)
+
+
+def run_batch(posts: int, concurrency: int, log: RunLog) -> dict:
+    import team
+
+    with tempfile.TemporaryDirectory() as workdir:
+        input_path = os.path.join(workdir, "input.jsonl")
+        output_path = os.path.join(workdir, "output.jsonl")
+        with open(input_path, "w", encoding="utf-8") as input_file:
+            for i in range(posts):
+                input_file.write(json.dumps(dict(team.EXAMPLE_USER_INPUT, id=i)) + "\n")
+
+        creator = team.LinkedInContentCreator(team=team.create_linkedin_content_team(), use_cache=False)
+        runs_before = len(log.runs)
+        start = time.perf_counter()
+        creator.run_batch(input_path, output_path, concurrency)
+        elapsed = time.perf_counter() - start
+
+        with open(output_path, encoding="utf-8") as output_file:
+            latencies = [json.loads(line)["elapsed_seconds"] for line in output_file]
+    return scenario_result(latencies, elapsed, log.runs[runs_before:], posts)
+
+
+def run_concurrent(posts: int, concurrency: int, log: RunLog) -> dict:
+    import team
+
+    creators = [
+        team.LinkedInContentCreator(team=team.create_linkedin_content_team(), use_cache=False) for _ in range(concurrency)
+    ]
+    latencies = []
+
+    async def worker(creator, count: int):
+        for _ in range(count):
+            item_start = time.perf_counter()
+            await creator.acreate_networking_content(team.EXAMPLE_USER_INPUT)
+            latencies.append(time.perf_counter() - item_start)
+
+    async def main():
+        shares = [posts // concurrency + (1 if i < posts % concurrency else 0) for i in range(concurrency)]
+        await asyncio.gather(*(worker(creator, share) for creator, share in zip(creators, shares)))
+
+    runs_before = len(log.runs)
+    start = time.perf_counter()
+    asyncio.run(main())
+    elapsed = time.perf_counter() - start
+    return scenario_result(latencies, elapsed, log.runs[runs_before:], posts)
+
+
+def run_scenario(name: str, args: argparse.Namespace) -> dict:
+    install_stubs(args.model_latency, args.output_tokens, args.search_latency)
+    log = RunLog()
+    runners = {
+        "single": lambda: run_single(args.posts, log),
+        "batch": lambda: run_batch(args.posts, args.concurrency, log),
+        "concurrent": lambda: run_concurrent(args.posts, args.concurrency, log),
+    }
+    return runners[name]()
+
+
+def run_scenario_process(name: str, args: argparse.Namespace) -> dict:
+    """Run one scenario in a fresh interpreter and return its results."""
+    completed = subprocess.run(
+        [
+            sys.executable, "-m", "benchmarks.offline", "--run-scenario", name,
+            "--posts", str(args.posts),
+            "--concurrency", str(args.concurrency),
+            "--model-latency", str(args.model_latency),
+            "--output-tokens", str(args.output_tokens),
+            "--search-latency", str(args.search_latency),
+        ],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=20, help="posts per scenario")
+    parser.add_argument("--concurrency", type=int, default=4, help="concurrency for batch/concurrent scenarios")
+    parser.add_argument("--model-latency", type=float, default=0.05, help="stub seconds per model call")
+    parser.add_argument("--output-tokens", type=int, default=120, help="stub output tokens per final answer")
+    parser.add_argument("--search-latency", type=float, default=0.02, help="fake DDG seconds per request")
+    parser.add_argument("--scenarios", default="single,batch,concurrent", help="comma-separated subset to run")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--run-scenario", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_scenario:
+        print(json.dumps(run_scenario(args.run_scenario, args)))
+        return
+
+    results = {
+        "commit": git_commit(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "run_scenario")},
+        "scenarios": {},
+    }
+    for name in args.scenarios.split(","):
+        results["scenarios"][name] = run_scenario_process(name, args)
+        summary = results["scenarios"][name]
+        print(
+            f"{name:<11} {summary['throughput_posts_per_second']:>7} posts/s  "
+            f"p50 {summary['latency_p50_seconds']:.3f}s  p95 {summary['latency_p95_seconds']:.3f}s  "
+            f"peak RSS {summary['peak_rss_mb']} MB  {summary['model_round_trips_per_post']} model calls/post"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Cold-start benchmark for team.py.
+
+Each repetition runs in a fresh interpreter and records:
+- import_seconds: `import team`
+- build_seconds: `build_team()` (agents, tools, shared Gemini client)
+- first_request_ready_seconds: import + build + prompt rendering, i.e. the
+  wall time until the first model request could be sent
+- first_request_seconds (--live or --offline): import + build + a real
+  create_networking_content call; with --offline the model, search and image
+  backends are the stubs from stubs.py, installed as part of the build
+
+Probes keep their caches in memory and images in a temp directory, so
+nothing is written into the checkout.
+
+Usage: python -m benchmarks.startup [--repeat 5] [--live | --offline] [--output results.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, os, sys, time
+start = time.perf_counter()
+import team
+imported = time.perf_counter()
+team.load_environment()
+if sys.argv[1] == "offline":
+    # Counted in build_seconds: it mostly imports the agno modules the build would import anyway
+    from benchmarks.stubs import install_stubs
+    install_stubs()
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")
+team.build_team()
+built = time.perf_counter()
+creator = team.LinkedInContentCreator()
+creator.build_prompt(team.EXAMPLE_USER_INPUT)
+ready = time.perf_counter()
+result = {
+    "import_seconds": imported - start,
+    "build_seconds": built - imported,
+    "first_request_ready_seconds": ready - start,
+}
+if sys.argv[1] in ("live", "offline"):
+    creator.create_networking_content(team.EXAMPLE_USER_INPUT)
+    result["first_request_seconds"] = time.perf_counter() - start
+print(json.dumps(result))
+"""
+
+
+def run_probe(mode: str) -> dict:
+    with tempfile.TemporaryDirectory(prefix="startup-probe-") as workdir:
+        env = dict(
+            os.environ,
+            RESEARCH_CACHE_PATH=":memory:",
+            RESPONSE_CACHE_PATH=":memory:",
+            PROFILE_CACHE_PATH=":memory:",
+            IMAGE_STORE_PATH=os.path.join(workdir, "images"),
+        )
+        completed = subprocess.run(
+            [sys.executable, "-c", PROBE, mode],
+            cwd=REPO_ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="number of fresh interpreters to sample")
+    modes = parser.add_mutually_exclusive_group()
+    modes.add_argument("--live", action="store_true", help="also time a real first request (needs GOOGLE_API_KEY)")
+    modes.add_argument("--offline", action="store_true", help="also time a first request against the stub backends")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    mode = "live" if args.live else "offline" if args.offline else "dry"
+    samples = [run_probe(mode) for _ in range(args.repeat)]
+    summary = {
+        metric: {
+            "median": round(statistics.median(sample[metric] for sample in samples), 4),
+            "min": round(min(sample[metric] for sample in samples), 4),
+            "max": round(max(sample[metric] for sample in samples), 4),
+        }
+        for metric in samples[0]
+    }
+    results = {"repeat": args.repeat, "mode": mode, "python": sys.version.split()[0], "metrics": summary}
+
+    for metric, values in summary.items():
+        print(f"{metric:<30} median {values['median']:.4f}s  (min {values['min']:.4f}s, max {values['max']:.4f}s)")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""Offline stand-ins for Gemini and DuckDuckGo so benchmarks run without network or quota.
+
+StubGemini is a deterministic agno Model with configurable latency, token
+counts and 429 rate that behaves like the real team:
+- with transfer_task_to_member available it delegates to each member listed
+  in its system prompt, once each, then writes the final answer
+- as a member it makes one call to the first known tool it has, then answers
+
+FakeDDGS replaces the ddgs client used by DuckDuckGoTools, and
+stub_image_generator stands in for Imagen behind the visual queue.
+
+install_stubs() switches team.py over to both.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+
+from agno.exceptions import ModelProviderError
+from agno.models.base import Model
+from agno.models.response import ModelResponse
+from google.genai.errors import ClientError
+
+from gemini_scheduler import ScheduledModelMixin
+
+# Tools the stub is allowed to call, in order of preference, with valid arguments
+STUB_TOOL_ARGUMENTS = {
+    "duckduckgo_search": {"query": "Kubernetes trends Google Microsoft", "max_results": 5},
+    "generate_networking_hashtags": {"target_companies": ["Google", "Microsoft"], "industry": "Technology"},
+    "create_networking_cta": {"target_companies": ["Google", "Microsoft"], "content_type": "learning"},
+    "identify_target_companies": {"industry": "Technology", "role": "Software Engineer"},
+    "queue_visual": {"prompt": "Infographic: microservices architecture improved scalability by 300%"},
+}
+
+WORDS = "networking kubernetes microservices scalability engineers insight connect architecture".split()
+
+
+@dataclass
+class StubGemini(Model):
+    id: str = "stub-gemini"
+    name: str = "StubGemini"
+    provider: str = "Stub"
+
+    latency_seconds: float = 0.05
+    output_tokens: int = 120
+    stream_chunks: int = 8
+    rate_limit_rate: float = 0.0
+
+    def _respond(self, messages: List[Any], tools: Optional[List[Dict[str, Any]]]) -> ModelResponse:
+        if self.rate_limit_rate and random.random() < self.rate_limit_rate:
+            error = {"error": {"code": 429, "message": "Resource has been exhausted (stub)", "status": "RESOURCE_EXHAUSTED"}}
+            raise ModelProviderError(
+                "429 RESOURCE_EXHAUSTED (stub)", status_code=429, model_name=self.name, model_id=self.id
+            ) from ClientError(429, error)
+        tool_names = [tool["function"]["name"] for tool in tools or [] if tool.get("type") == "function"]
+        tool_results = sum(1 for message in messages if message.role == "tool")
+        input_tokens = sum(len(str(message.content or "")) for message in messages) // 4
+        response = ModelResponse(role="assistant", response_usage={"input_tokens": input_tokens, "output_tokens": 0})
+
+        tool_call = self._next_tool_call(messages, tool_names, tool_results)
+        if tool_call is not None:
+            name, arguments = tool_call
+            response.tool_calls = [{
+                "id": f"stub_call_{tool_results}",
+                "type": "function",
+                "function": {"name": name, "arguments": json.dumps(arguments)},
+            }]
+            response.response_usage["output_tokens"] = 20
+            return response
+
+        response.content = " ".join(WORDS[i % len(WORDS)] for i in range(self.output_tokens))
+        response.response_usage["output_tokens"] = self.output_tokens
+        return response
+
+    def _next_tool_call(self, messages: List[Any], tool_names: List[str], tool_results: int):
+        if "transfer_task_to_member" in tool_names:
+            system_prompt = next((str(m.content) for m in messages if m.role == "system"), "")
+            member_ids = re.findall(r"- ID: (\S+)", system_prompt)
+            if tool_results < len(member_ids):
+                return "transfer_task_to_member", {
+                    "member_id": member_ids[tool_results],
+                    "task_description": "Handle your part of the LinkedIn post.",
+                    "expected_output": "Your stage output.",
+                }
+            return None
+        if tool_results == 0:
+            for name, arguments in STUB_TOOL_ARGUMENTS.items():
+                if name in tool_names:
+                    return name, arguments
+        return None
+
+    def _stream(self, response: ModelResponse):
+        if not response.content:
+            yield response
+            return
+        words = response.content.split(" ")
+        step = max(1, len(words) // self.stream_chunks)
+        for start in range(0, len(words), step):
+            last = start + step >= len(words)
+            yield ModelResponse(
+                role="assistant",
+                content=" ".join(words[start:start + step]) + ("" if last else " "),
+                response_usage=response.response_usage if last else None,
+            )
+
+    def invoke(self, messages, response_format=None, tools=None, tool_choice=None, **kwargs):
+        time.sleep(self.latency_seconds)
+        return self._respond(messages, tools)
+
+    async def ainvoke(self, messages, response_format=None, tools=None, tool_choice=None, **kwargs):
+        await asyncio.sleep(self.latency_seconds)
+        return self._respond(messages, tools)
+
+    def invoke_stream(self, messages, response_format=None, tools=None, tool_choice=None, **kwargs):
+        time.sleep(self.latency_seconds)
+        yield from self._stream(self._respond(messages, tools))
+
+    async def ainvoke_stream(self, messages, response_format=None, tools=None, tool_choice=None, **kwargs):
+        await asyncio.sleep(self.latency_seconds)
+        for delta in self._stream(self._respond(messages, tools)):
+            yield delta
+
+    def parse_provider_response(self, response: ModelResponse, **kwargs) -> ModelResponse:
+        return response
+
+    def parse_provider_response_delta(self, response: ModelResponse) -> ModelResponse:
+        return response
+
+
+class ScheduledStubGemini(ScheduledModelMixin, StubGemini):
+    """StubGemini routed through the Gemini scheduler, like the real model."""
+
+
+class FakeDDGS:
+    """Drop-in for ddgs.DDGS returning deterministic results after a fixed delay."""
+
+    latency_seconds = 0.02
+    calls = 0
+    _lock = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def _results(self, query: str, max_results: int) -> List[Dict[str, str]]:
+        with FakeDDGS._lock:
+            FakeDDGS.calls += 1
+        time.sleep(self.latency_seconds)
+        return [
+            {"title": f"{query} result {i}", "href": f"https://example.com/{i}", "body": f"Summary {i} about {query}."}
+            for i in range(max_results)
+        ]
+
+    def text(self, query: str, max_results: int = 5, **kwargs):
+        return self._results(query, max_results)
+
+    def news(self, query: str, max_results: int = 5, **kwargs):
+        return [dict(result, date="2025-01-01", source="Example News") for result in self._results(query, max_results)]
+
+
+def stub_image_generator(latency_seconds: float = 0.5):
+    """Image generator for VisualQueue that returns a tiny PNG unique to the prompt after a delay."""
+    import hashlib
+    import struct
+    import zlib
+
+    def generate(prompt: str) -> bytes:
+        time.sleep(latency_seconds)
+        red, green, blue = hashlib.sha256(prompt.encode("utf-8")).digest()[:3]
+        chunk = lambda kind, data: struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+        return (
+            b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(bytes([0, red, green, blue])))
+            + chunk(b"IEND", b"")
+        )
+
+    return generate
+
+
+def install_stubs(
+    latency_seconds: float = 0.05,
+    output_tokens: int = 120,
+    search_latency_seconds: float = 0.02,
+    image_latency_seconds: float = 0.5,
+    rate_limit_rate: float = 0.0,
+):
+    """Route every model team.py builds to StubGemini, every DDG search to FakeDDGS and images to stub_image_generator.
+
+    Also points the research cache at an in-memory database and the image
+    store at a temporary directory, and clears the memoized team/client so
+    nothing real is reused. Models go through the Gemini scheduler; its
+    limits are raised unless GEMINI_* variables are already set.
+    """
+    import os
+    import tempfile
+
+    import agno.tools.duckduckgo
+    import gemini_scheduler
+    import team
+
+    os.environ.setdefault("GOOGLE_API_KEY", "offline-benchmark")
+    os.environ["RESEARCH_CACHE_PATH"] = ":memory:"
+    os.environ.setdefault("GEMINI_RPM", "1000000")
+    os.environ.setdefault("GEMINI_TPM", "1000000000")
+    os.environ.setdefault("GEMINI_MAX_CONCURRENCY", "64")
+    os.environ["IMAGE_STORE_PATH"] = tempfile.mkdtemp(prefix="offline-images-")
+    agno.tools.duckduckgo.DDGS = FakeDDGS
+    FakeDDGS.latency_seconds = search_latency_seconds
+    FakeDDGS.calls = 0
+    team.create_gemini_model = lambda: ScheduledStubGemini(
+        latency_seconds=latency_seconds, output_tokens=output_tokens, rate_limit_rate=rate_limit_rate
+    )
+    team.create_image_generator = lambda: stub_image_generator(image_latency_seconds)
+    team.build_team.cache_clear()
+    team.get_visual_queue.cache_clear()
+    gemini_scheduler.get_scheduler.cache_clear()
+    team.get_research_tools.cache_clear()
@@ -0,0 +1,418 @@
+"""Local company knowledge base behind identify_target_companies.
+
+Companies are loaded from a CSV or Parquet file into an in-memory inverted
+index (token -> company ids per field). For querying, each posting set is also
+kept as an int bitmask over companies in rank order, so a filtered, ranked
+lookup is a handful of big-int ANDs plus reading the lowest set bits, well
+under a millisecond for tens of thousands of companies. Role keywords are
+counted per company with bit-sliced counters, so long role strings stay cheap.
+
+Lookups read an immutable snapshot (rows and masks in rank order). At most
+every `check_interval` seconds a lookup stats the data file; if it changed,
+a background thread re-reads it and diffs the raw rows by id/name, parsing
+only rows that differ. Up to
+MAX_PATCHED_ROWS changed rows are patched in place: each is cut out of every
+mask at its old rank position and inserted at its new one. Larger changes
+rebuild the masks. Either way the new snapshot is built aside and swapped in
+with one assignment, so lookups never wait for a reload.
+
+Filters are forgiving of free-form values: query words match by prefix,
+unknown words are ignored, and filters are relaxed when nothing matches
+(see CompanyIndex.search).
+
+Expected columns (extra columns are kept and returned as-is):
+name, industry, size, location, employees, networking_potential,
+key_people, content_strategy. `location` and `key_people` hold
+";"-separated lists.
+"""
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import csv
+import os
+import re
+import threading
+import time
+
+DEFAULT_COMPANY_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "companies.csv")
+
+LIST_FIELDS = ("location", "key_people")
+INDEXED_FIELDS = ("industry", "size", "location", "role")
+POTENTIAL_ORDER = {"high": 0, "medium": 1, "low": 2}
+ANY_LOCATION = {"", "global", "any", "worldwide", "remote"}
+MIN_PREFIX_LENGTH = 3
+MAX_PATCHED_ROWS = 1000
+STOPWORDS = {"a", "an", "and", "at", "for", "in", "of", "the", "to", "with"}
+
+
+def tokenize(text: str) -> Set[str]:
+    """Lowercase word tokens with trailing plural "s" dropped, so "Engineers" matches "engineer"."""
+    tokens = set()
+    for token in re.findall(r"[a-z0-9+#]+", text.casefold()):
+        if token in STOPWORDS:
+            continue
+        tokens.add(token[:-1] if len(token) > 3 and token.endswith("s") and not token.endswith("ss") else token)
+    return tokens
+
+
+def read_raw_rows(path: str) -> Tuple[List[str], List[Tuple]]:
+    """Column names and unparsed value tuples of a .csv or .parquet company file.
+
+    Cheap enough to run on every reload, so unchanged rows can be skipped
+    before they are parsed.
+    """
+    if path.endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("`pyarrow` not installed. Please install using `pip install pyarrow` to load Parquet company data")
+        table = pq.read_table(path)
+        return table.column_names, list(zip(*(column.to_pylist() for column in table.columns)))
+    with open(path, newline="", encoding="utf-8") as data_file:
+        reader = csv.reader(data_file)
+        header = [column.strip() for column in next(reader, [])]
+        width = len(header)
+        return header, [
+            tuple(values) if len(values) == width else tuple(values[:width]) + (None,) * (width - len(values))
+            for values in reader
+            if values
+        ]
+
+
+def company_row(header: List[str], values: Tuple) -> Dict:
+    """Parse one raw row: split list columns and make employees an int."""
+    row = dict(zip(header, values))
+    for field in LIST_FIELDS:
+        value = row.get(field)
+        if isinstance(value, str):
+            row[field] = [item.strip() for item in value.split(";") if item.strip()]
+        elif value is None:
+            row[field] = []
+    try:
+        row["employees"] = int(row.get("employees") or 0)
+    except (TypeError, ValueError):
+        row["employees"] = 0
+    return row
+
+
+def load_company_rows(path: str) -> List[Dict]:
+    """Read company rows from a .csv or .parquet file, splitting list columns."""
+    header, records = read_raw_rows(path)
+    return [company_row(header, values) for values in records]
+
+
+class _Snapshot:
+    """What lookups read: rows and bitmasks in rank order. Reloads build a new one and swap it in."""
+
+    __slots__ = ("rows", "keys", "bits", "vocabulary", "all_bits")
+
+    def __init__(self, rows: List[Dict], keys: List[Tuple], bits: Dict[str, Dict[str, int]]):
+        self.rows = rows
+        self.keys = keys
+        self.bits = bits
+        self.vocabulary = {field: sorted(masks) for field, masks in bits.items()}
+        self.all_bits = (1 << len(rows)) - 1
+
+
+class CompanyIndex:
+    """In-memory inverted index over a company dataset with incremental reloads.
+
+    Raises FileNotFoundError if the data file does not exist; if it disappears
+    later, the last loaded companies keep being served.
+    """
+
+    def __init__(self, path: Optional[str] = None, check_interval: float = 1.0):
+        self.path = path or os.getenv("COMPANY_DATA_PATH", DEFAULT_COMPANY_DATA_PATH)
+        self.check_interval = check_interval
+        self.reloads = 0
+        self.patched_reloads = 0
+        self._companies: Dict[str, Dict] = {}
+        self._raw: Dict[str, Tuple] = {}
+        self._by_name: Dict[str, Dict] = {}
+        self._header: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._next_id = 0
+        self._snapshot = _Snapshot([], [], {field: {} for field in INDEXED_FIELDS})
+        self._signature = None
+        self._checked_at = time.monotonic()
+        self._reload_lock = threading.Lock()
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Company data file not found: {self.path} (set COMPANY_DATA_PATH)")
+        self.reload()
+
+    def __len__(self) -> int:
+        return len(self._snapshot.rows)
+
+    def reload(self, force: bool = False) -> Dict[str, int]:
+        """Re-index rows that changed since the last load. Returns added/updated/removed counts."""
+        with self._reload_lock:
+            return self._reload(force)
+
+    def _reload(self, force: bool = False) -> Dict[str, int]:
+        self._checked_at = time.monotonic()
+        signature = self._file_signature()
+        if signature is None or (signature == self._signature and not force):
+            return {"added": 0, "updated": 0, "removed": 0}
+        header, records = read_raw_rows(self.path)
+        if header != self._header:
+            self._raw, self._header = {}, header
+        name_column = header.index("name") if "name" in header else None
+        id_column = header.index("id") if "id" in header else None
+        incoming: Dict[str, Tuple] = {}
+        for values in records:
+            name = values[name_column] if name_column is not None else None
+            if name:
+                identity = values[id_column] if id_column is not None else None
+                incoming[str(identity or name).casefold()] = values
+        removed = [key for key in self._companies if key not in incoming]
+        changed = [(key, company_row(header, values)) for key, values in incoming.items() if self._raw.get(key) != values]
+        changes = self._apply(removed, changed)
+        self._raw = incoming
+        self._signature = signature
+        self.reloads += 1
+        return changes
+
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def refresh(self):
+        """Start a background reload if the data file changed and the last check is older than check_interval.
+
+        Never blocks: lookups keep reading the current snapshot until the
+        reload swaps in the new one.
+        """
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        signature = self._file_signature()
+        if signature is None or signature == self._signature or not self._reload_lock.acquire(blocking=False):
+            return
+        threading.Thread(target=self._reload_in_background, name="company-index-reload", daemon=True).start()
+
+    def _reload_in_background(self):
+        try:
+            self._reload()
+        except Exception as e:
+            print(f"⚠️ Company data reload failed, still serving the previous data: {type(e).__name__}: {e}")
+        finally:
+            self._reload_lock.release()
+
+    def _apply(self, removed: List[str], changed: List[Tuple[str, Dict]]) -> Dict[str, int]:
+        changes = {
+            "added": sum(1 for key, _ in changed if key not in self._companies),
+            "updated": sum(1 for key, _ in changed if key in self._companies),
+            "removed": len(removed),
+        }
+        if not removed and not changed:
+            return changes
+
+        if self._snapshot.rows and len(removed) + len(changed) <= MAX_PATCHED_ROWS:
+            snapshot = self._patched(removed, changed)
+            self.patched_reloads += 1
+        else:
+            snapshot = None
+        for key in removed:
+            self._by_name.pop(_name_key(self._companies[key]["name"]), None)
+            del self._companies[key]
+            del self._ids[key]
+        for key, row in changed:
+            if key in self._companies:
+                self._by_name.pop(_name_key(self._companies[key]["name"]), None)
+            self._by_name[_name_key(row["name"])] = row
+            self._companies[key] = row
+            if key not in self._ids:
+                self._ids[key] = self._next_id
+                self._next_id += 1
+        # One assignment, so a concurrent lookup sees either the old or the new index
+        self._snapshot = snapshot if snapshot is not None else self._built()
+        return changes
+
+    def _rank_key(self, key: str, row: Dict) -> Tuple:
+        return _static_rank(row) + (self._ids[key],)
+
+    def _built(self) -> _Snapshot:
+        """Full build: bit i of a token's mask is set when the i-th best-ranked company has the token."""
+        order = sorted((self._rank_key(key, row), row) for key, row in self._companies.items())
+        width = len(order) // 8 + 1
+        byte_masks: Dict[str, Dict[str, bytearray]] = {field: {} for field in INDEXED_FIELDS}
+        for i, (_, row) in enumerate(order):
+            for field, tokens in _field_tokens(row).items():
+                for token in tokens:
+                    mask = byte_masks[field].get(token)
+                    if mask is None:
+                        mask = byte_masks[field][token] = bytearray(width)
+                    mask[i >> 3] |= 1 << (i & 7)
+        bits = {
+            field: {token: int.from_bytes(mask, "little") for token, mask in masks.items()}
+            for field, masks in byte_masks.items()
+        }
+        return _Snapshot([row for _, row in order], [rank_key for rank_key, _ in order], bits)
+
+    def _patched(self, removed: List[str], changed: List[Tuple[str, Dict]]) -> _Snapshot:
+        """Copy of the current snapshot with only the given rows taken out and re-inserted at their rank."""
+        current = self._snapshot
+        rows, keys = list(current.rows), list(current.keys)
+        bits = {field: dict(masks) for field, masks in current.bits.items()}
+
+        for key in removed + [key for key, _ in changed if key in self._companies]:
+            position = bisect_left(keys, self._rank_key(key, self._companies[key]))
+            del rows[position], keys[position]
+            low = (1 << position) - 1
+            for masks in bits.values():
+                for token, mask in masks.items():
+                    masks[token] = (mask & low) | ((mask >> (position + 1)) << position)
+
+        next_id = self._next_id
+        for key, row in changed:
+            if key in self._ids:
+                rank_key = self._rank_key(key, row)
+            else:
+                rank_key = _static_rank(row) + (next_id,)
+                next_id += 1
+            position = bisect_left(keys, rank_key)
+            rows.insert(position, row)
+            keys.insert(position, rank_key)
+            low = (1 << position) - 1
+            for field, tokens in _field_tokens(row).items():
+                masks = bits[field]
+                for token, mask in masks.items():
+                    masks[token] = (mask & low) | ((mask >> position) << (position + 1)) | ((token in tokens) << position)
+                for token in tokens - masks.keys():
+                    masks[token] = 1 << position
+
+        for masks in bits.values():
+            for token in [token for token, mask in masks.items() if not mask]:
+                del masks[token]
+        return _Snapshot(rows, keys, bits)
+
+    def search(
+        self,
+        industry: Optional[str] = None,
+        role: Optional[str] = None,
+        location: Optional[str] = None,
+        size: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[Dict]:
+        """Companies matching the given industry/size/location, best role match first.
+
+        A query word also matches indexed words it is a prefix of ("Tech" ->
+        "Technology"), and words that match nothing ("CA" in "San Francisco,
+        CA") are ignored, as is a filter no company matches. If nothing matches
+        every filter, the location, then size, then industry filter is dropped
+        until something does. Ties (and
+        companies with no role match) are ordered by networking potential,
+        then employee count.
+        """
+        self.refresh()
+        snapshot = self._snapshot
+        if location and location.strip().casefold() in ANY_LOCATION:
+            location = None
+        field_masks = [
+            _field_mask(snapshot, field, value)
+            for field, value in (("industry", industry), ("size", size), ("location", location))
+            if value
+        ]
+        # A filter no company matches on its own is ignored rather than emptying the result
+        filters = [mask for mask in field_masks if mask]
+        candidates = 0
+        for kept in range(len(filters), -1, -1):
+            candidates = snapshot.all_bits
+            for mask in filters[:kept]:
+                candidates &= mask
+            if candidates:
+                break
+
+        planes = _count_planes(candidates & snapshot.bits["role"].get(token, 0) for token in tokenize(role or ""))
+        # Tiers by number of role keywords matched, best first; within a tier, rank order
+        ranked: List[int] = []
+        for matched in range((1 << len(planes)) - 1, 0, -1):
+            tier = candidates
+            for bit, plane in enumerate(planes):
+                tier &= plane if matched >> bit & 1 else ~plane
+            ranked.extend(_lowest_bits(tier, limit - len(ranked)))
+            if len(ranked) >= limit:
+                break
+        unmatched = candidates
+        for plane in planes:
+            unmatched &= ~plane
+        ranked.extend(_lowest_bits(unmatched, limit - len(ranked)))
+        return [_public(snapshot.rows[i]) for i in ranked]
+
+    def lookup(self, names: Iterable[str]) -> List[Dict]:
+        """The named companies, in the given order; names not in the dataset are skipped."""
+        self.refresh()
+        rows = (self._by_name.get(_name_key(name)) for name in names)
+        return [_public(row) for row in rows if row is not None]
+
+    def stats(self) -> Dict:
+        return {
+            "companies": len(self._snapshot.rows),
+            "reloads": self.reloads,
+            "patched_reloads": self.patched_reloads,
+            "path": self.path,
+        }
+
+
+def _name_key(name: str) -> str:
+    return " ".join(str(name).casefold().split())
+
+
+def _field_tokens(row: Dict) -> Dict[str, Set[str]]:
+    return {
+        "industry": tokenize(str(row.get("industry") or "")),
+        "size": tokenize(str(row.get("size") or "")),
+        "location": tokenize(" ".join(row.get("location") or [])),
+        "role": tokenize(" ".join(row.get("key_people") or [])),
+    }
+
+
+def _field_mask(snapshot: _Snapshot, field: str, value: str) -> int:
+    """Companies whose `field` has every query word that matches anything, by exact word or prefix."""
+    masks, vocabulary = snapshot.bits[field], snapshot.vocabulary[field]
+    result, matched_any = snapshot.all_bits, False
+    for query_token in tokenize(value):
+        token_mask = masks.get(query_token, 0)
+        if len(query_token) >= MIN_PREFIX_LENGTH:
+            i = bisect_left(vocabulary, query_token)
+            while i < len(vocabulary) and vocabulary[i].startswith(query_token):
+                token_mask |= masks[vocabulary[i]]
+                i += 1
+        if token_mask:
+            result &= token_mask
+            matched_any = True
+    return result if matched_any else 0
+
+
+def _count_planes(masks: Iterable[int]) -> List[int]:
+    """Bit-sliced per-company counts of the masks: bit i of planes[j] is bit j of company i's count."""
+    planes: List[int] = []
+    for carry in masks:
+        for j, plane in enumerate(planes):
+            if not carry:
+                break
+            planes[j], carry = plane ^ carry, plane & carry
+        if carry:
+            planes.append(carry)
+    return planes
+
+
+def _lowest_bits(mask: int, count: int) -> List[int]:
+    """Positions of the `count` lowest set bits of mask."""
+    positions = []
+    while mask and len(positions) < count:
+        lowest = mask & -mask
+        positions.append(lowest.bit_length() - 1)
+        mask ^= lowest
+    return positions
+
+
+def _static_rank(row: Dict):
+    return (POTENTIAL_ORDER.get(str(row.get("networking_potential") or "").casefold(), 3), -row["employees"], row["name"])
+
+
+def _public(row: Dict) -> Dict:
+    return {key: value for key, value in row.items() if key != "id" and value not in (None, "")}
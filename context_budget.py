@@ -0,0 +1,194 @@
+"""Token budget for the context a team run feeds back into its own prompts.
+
+With enable_agentic_context and share_member_interactions, every member's full
+output (and the raw search JSON behind it) is replayed into later members'
+prompts, so input tokens grow with every step. A ContextBudget caps what one
+run may spend on that replayed context and on tool results:
+
+- shared team context and member interactions are compacted to fit, splitting
+  the allowance fairly between interactions; the most recent member output
+  (typically the draft the next member works on) is always passed whole
+- JSON tool results are minified and cut to the top-k results
+- anything still over its allowance is summarized (when a summarizer is given)
+  or truncated with a marker
+
+Content is charged against the budget once, the first time it is replayed;
+later replays of the same interaction or context do not shrink the allowance.
+
+The budget is bound to the current run through a ContextVar, so the shared
+DuckDuckGo toolkit and BudgetedTeam pick it up without extra plumbing.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import json
+import re
+import threading
+
+from agno.team import Team
+
+current_budget: ContextVar[Optional["ContextBudget"]] = ContextVar("current_budget", default=None)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), good enough for budgeting."""
+    return (len(text) + 3) // 4
+
+
+def minify_json(text: str, top_k: Optional[int] = None) -> str:
+    """Re-serialize JSON without whitespace, keeping only the first top_k items of a list. Non-JSON is returned as-is."""
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        return text
+    if top_k is not None and isinstance(data, list):
+        data = data[:top_k]
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def truncate(text: str, max_tokens: int) -> str:
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    keep = max(0, max_tokens * 4)
+    trimmed = estimate_tokens(text[keep:])
+    return f"{text[:keep].rstrip()} …[{trimmed} tokens trimmed]"
+
+
+class ContextBudget:
+    """Per-run token budget for replayed context and tool results.
+
+    `summarizer`, if given, is called as summarizer(text, max_tokens) for
+    text that still exceeds its allowance after lossless compaction; it
+    should return a shorter text. By default such text is truncated.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 8000,
+        shared_context_tokens: int = 2500,
+        tool_result_tokens: int = 1000,
+        top_k_results: int = 3,
+        min_tokens: int = 200,
+        summarizer: Optional[Callable[[str, int], str]] = None,
+    ):
+        self.max_tokens = max_tokens
+        self.shared_context_tokens = shared_context_tokens
+        self.tool_result_tokens = tool_result_tokens
+        self.top_k_results = top_k_results
+        self.min_tokens = min_tokens
+        self.summarizer = summarizer
+        self.used_tokens = 0
+        self.saved_tokens = 0
+        self.compactions = 0
+        self._charged: Set[int] = set()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def activate(self):
+        """Bind this budget to the current run (thread / asyncio task)."""
+        token = current_budget.set(self)
+        try:
+            yield self
+        finally:
+            current_budget.reset(token)
+
+    def allowance(self, requested: int) -> int:
+        """Tokens the next piece of context may use given what the run has already spent."""
+        remaining = self.max_tokens - self.used_tokens
+        return max(self.min_tokens, min(requested, remaining))
+
+    def _shrink(self, text: str, max_tokens: int) -> str:
+        if estimate_tokens(text) <= max_tokens:
+            return text
+        if self.summarizer is not None:
+            summary = self.summarizer(text, max_tokens)
+            if estimate_tokens(summary) <= max_tokens:
+                return summary
+            text = summary
+        return truncate(text, max_tokens)
+
+    def _account(self, original: str, compacted: str) -> str:
+        with self._lock:
+            before, after = estimate_tokens(original), estimate_tokens(compacted)
+            if hash(original) not in self._charged:
+                self._charged.add(hash(original))
+                self.used_tokens += after
+            if after < before:
+                self.saved_tokens += before - after
+                self.compactions += 1
+        return compacted
+
+    def fit_tool_result(self, result: str) -> str:
+        """Minify and cut a tool result (e.g. search JSON) to its allowance."""
+        compacted = minify_json(result, self.top_k_results)
+        compacted = self._shrink(compacted, self.allowance(self.tool_result_tokens))
+        return self._account(result, compacted)
+
+    def fit_shared_context(self, team_context: Optional[str], interactions: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        """Compact the team context and member interactions replayed into a member's prompt."""
+        if not team_context and not interactions:
+            return team_context, interactions
+        allowance = self.allowance(self.shared_context_tokens)
+
+        compacted_context = team_context
+        if team_context:
+            compacted_context = self._shrink(_collapse_whitespace(team_context), max(self.min_tokens, allowance // 4))
+            self._account(team_context, compacted_context)
+            allowance = max(self.min_tokens, allowance - estimate_tokens(compacted_context))
+
+        compacted_interactions = interactions
+        if interactions:
+            compacted_interactions = self._fit_interactions(_collapse_whitespace(interactions), allowance)
+        return compacted_context, compacted_interactions
+
+    def _fit_interactions(self, interactions: str, max_tokens: int) -> str:
+        """Shrink earlier member interactions so small ones stay whole and large ones share the rest equally.
+
+        The latest interaction is kept whole. Each interaction is charged
+        against the budget separately, so replaying it again costs nothing.
+        """
+        match = re.match(r"(?s)^(\s*<member[ _]interactions>\n)(.*?)(\n?</member[ _]interactions>\s*)$", interactions)
+        if match is None:
+            return self._account(interactions, self._shrink(interactions, max_tokens))
+        opening, body, closing = match.groups()
+        blocks: List[str] = [block for block in re.split(r"\n(?=Member: )", body) if block.strip()]
+        if not blocks:
+            return interactions
+
+        fitted = blocks
+        if estimate_tokens(interactions) > max_tokens:
+            earlier, latest = blocks[:-1], blocks[-1]
+            remaining = max_tokens - estimate_tokens(opening + closing + latest)
+            shares: Dict[int, int] = {}
+            for position, index in enumerate(sorted(range(len(earlier)), key=lambda i: estimate_tokens(earlier[i]))):
+                fair_share = max(0, remaining) // (len(earlier) - position)
+                shares[index] = min(estimate_tokens(earlier[index]), fair_share)
+                remaining -= shares[index]
+            fitted = [self._shrink(block, max(shares[i], self.min_tokens)) for i, block in enumerate(earlier)] + [latest]
+        for block, fitted_block in zip(blocks, fitted):
+            self._account(block, fitted_block)
+        return opening + "\n".join(fitted) + closing
+
+    def report(self) -> Dict[str, int]:
+        return {
+            "budget_tokens": self.max_tokens,
+            "used_tokens": self.used_tokens,
+            "saved_tokens": self.saved_tokens,
+            "compactions": self.compactions,
+        }
+
+
+def _collapse_whitespace(text: str) -> str:
+    text = re.sub(r"[ \t]+", " ", text)
+    return re.sub(r"\n\s*\n+", "\n\n", text)
+
+
+class BudgetedTeam(Team):
+    """Team that compacts replayed team context and member interactions to the active ContextBudget."""
+
+    def _determine_team_context(self, session_id, images, videos, audio):
+        team_context, interactions = super()._determine_team_context(session_id, images, videos, audio)
+        budget = current_budget.get()
+        if budget is None:
+            return team_context, interactions
+        return budget.fit_shared_context(team_context, interactions)
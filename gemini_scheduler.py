@@ -0,0 +1,410 @@
+"""Process-wide scheduler for every Gemini request.
+
+Without it, each team's coordinator, member agents and the image queue call
+Gemini on their own, so under load they exhaust the shared RPM/TPM quota
+together and retry into each other. Every call now goes through one
+GeminiScheduler, which:
+
+- admits calls through per-model token buckets for requests and tokens per minute
+- serves waiting interactive calls before batch calls (see `priority`)
+- caps calls in flight with an adaptive limit: halved on 429, reduced on 5xx,
+  raised by 1/limit per success (AIMD)
+- retries 429/5xx responses from the Gemini API and transport errors with
+  full-jitter exponential backoff, releasing its slot while it sleeps; any
+  other error (including agno's generic ModelProviderError wrapping) fails
+  immediately
+- reports queue depth, in-flight calls and wait times via stats()
+
+Limits come from GEMINI_RPM, GEMINI_TPM and GEMINI_MAX_CONCURRENCY.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+
+from agno.models.google import Gemini
+from google.genai.errors import ClientError, ServerError
+import httpx
+
+PRIORITIES = {"interactive": 0, "batch": 1}
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+TRANSPORT_ERRORS = (httpx.TransportError, ConnectionError, TimeoutError)
+TRANSPORT_ERROR_STATUS = 503
+EXPECTED_OUTPUT_TOKENS = 512
+
+current_priority: ContextVar[str] = ContextVar("current_priority", default="interactive")
+
+
+@contextmanager
+def priority(name: str):
+    """Run the enclosed calls (in this thread / asyncio task and its children) at the given priority."""
+    if name not in PRIORITIES:
+        raise ValueError(f"unknown priority {name!r}; use one of {', '.join(PRIORITIES)}")
+    token = current_priority.set(name)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+class TokenBucket:
+    """Refills `per_minute` units per minute, holding at most one minute's worth."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount: float, now: float) -> float:
+        """Seconds until `amount` can be taken (0 if it can be taken now)."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, amount: float):
+        """Return (positive) or charge (negative) units once actual usage is known."""
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class _Waiter:
+    __slots__ = ("model", "tokens", "priority", "enqueued_at", "event", "loop", "future", "granted", "cancelled")
+
+    def __init__(self, model: str, tokens: int, priority: str, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.model = model
+        self.tokens = tokens
+        self.priority = priority
+        self.enqueued_at = time.monotonic()
+        self.loop = loop
+        self.event = None if loop is not None else threading.Event()
+        self.future = loop.create_future() if loop is not None else None
+        self.granted = False
+        self.cancelled = False
+
+
+class GeminiScheduler:
+    def __init__(
+        self,
+        rpm: float = 60,
+        tpm: float = 1_000_000,
+        max_concurrency: int = 8,
+        max_retries: int = 5,
+        base_backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 30.0,
+    ):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.concurrency_limit = float(max_concurrency)
+        self.in_flight = 0
+        self.counters = {"calls": 0, "retries": 0, "rate_limited": 0, "server_errors": 0, "failed": 0}
+        self._waits: Dict[str, List[float]] = {name: [0, 0.0, 0.0] for name in PRIORITIES}  # count, total, max
+        self._buckets: Dict[str, Tuple[TokenBucket, TokenBucket]] = {}
+        self._heap: List = []
+        self._sequence = itertools.count()
+        self._timer: Optional[threading.Timer] = None
+        self._timer_at = 0.0
+        self._lock = threading.Lock()
+
+    # Admission
+
+    def _enqueue(self, waiter: _Waiter):
+        with self._lock:
+            heapq.heappush(self._heap, (PRIORITIES[waiter.priority], next(self._sequence), waiter))
+        self._dispatch()
+
+    def _dispatch(self):
+        """Grant queued calls, best priority first, while concurrency and buckets allow."""
+        with self._lock:
+            now = time.monotonic()
+            while self._heap:
+                waiter = self._heap[0][2]
+                if waiter.cancelled:
+                    heapq.heappop(self._heap)
+                    continue
+                if self.in_flight >= max(1, int(self.concurrency_limit)):
+                    return
+                requests, tokens = self._bucket(waiter.model)
+                delay = max(requests.delay(1, now), tokens.delay(waiter.tokens, now))
+                if delay > 0:
+                    self._wake_after(delay, now)
+                    return
+                heapq.heappop(self._heap)
+                requests.take(1)
+                tokens.take(waiter.tokens)
+                self.in_flight += 1
+                waiter.granted = True
+                self._record_wait(waiter.priority, now - waiter.enqueued_at)
+                if waiter.event is not None:
+                    waiter.event.set()
+                else:
+                    waiter.loop.call_soon_threadsafe(_resolve, waiter.future)
+
+    def _wake_after(self, delay: float, now: float):
+        if self._timer is not None and self._timer_at <= now + delay:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(delay, self._on_timer)
+        self._timer.daemon = True
+        self._timer_at = now + delay
+        self._timer.start()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+        self._dispatch()
+
+    def _bucket(self, model: str) -> Tuple[TokenBucket, TokenBucket]:
+        if model not in self._buckets:
+            self._buckets[model] = (TokenBucket(self.rpm), TokenBucket(self.tpm))
+        return self._buckets[model]
+
+    def _record_wait(self, priority_name: str, seconds: float):
+        stats = self._waits[priority_name]
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] = max(stats[2], seconds)
+
+    def acquire(self, model: str, tokens: int, priority_name: Optional[str] = None):
+        """Block until a call to `model` reserving `tokens` may start."""
+        waiter = _Waiter(model, tokens, priority_name or current_priority.get())
+        self._enqueue(waiter)
+        waiter.event.wait()
+
+    async def aacquire(self, model: str, tokens: int, priority_name: Optional[str] = None):
+        waiter = _Waiter(model, tokens, priority_name or current_priority.get(), asyncio.get_running_loop())
+        self._enqueue(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                waiter.cancelled = True
+                granted = waiter.granted
+            if granted:
+                self.release(model, tokens)
+            raise
+
+    def release(self, model: str, reserved: int, used: Optional[int] = None, status: Optional[int] = None):
+        """Finish a call: settle its token reservation and adapt the concurrency limit."""
+        with self._lock:
+            self.in_flight -= 1
+            self.counters["calls"] += 1
+            if used is not None:
+                self._bucket(model)[1].adjust(reserved - used)
+            if status == 429:
+                self.counters["rate_limited"] += 1
+                self.concurrency_limit = max(1.0, self.concurrency_limit / 2)
+            elif status is not None and status >= 500:
+                self.counters["server_errors"] += 1
+                self.concurrency_limit = max(1.0, self.concurrency_limit * 0.75)
+            elif status is None:
+                self.concurrency_limit = min(float(self.max_concurrency), self.concurrency_limit + 1 / self.concurrency_limit)
+        self._dispatch()
+
+    # Calls with retry
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_backoff_seconds, self.base_backoff_seconds * 2 ** attempt))
+
+    def _should_retry(self, error: Exception, attempt: int) -> bool:
+        retry = _status(error) in RETRYABLE_STATUS and attempt < self.max_retries
+        with self._lock:
+            self.counters["retries" if retry else "failed"] += 1
+        return retry
+
+    def call(self, fn: Callable[[], Any], model: str, tokens: int = 0, priority_name: Optional[str] = None) -> Any:
+        """Run fn() once admitted, retrying 429/5xx with jittered backoff."""
+        for attempt in itertools.count():
+            self.acquire(model, tokens, priority_name)
+            try:
+                result = fn()
+            except Exception as e:
+                self.release(model, tokens, status=_status(e) or 0)
+                if not self._should_retry(e, attempt):
+                    raise
+                time.sleep(self.backoff(attempt))
+                continue
+            self.release(model, tokens, used=_usage(result))
+            return result
+
+    async def acall(self, fn: Callable[[], Any], model: str, tokens: int = 0, priority_name: Optional[str] = None) -> Any:
+        """Async variant of call(); fn returns an awaitable."""
+        for attempt in itertools.count():
+            await self.aacquire(model, tokens, priority_name)
+            try:
+                result = await fn()
+            except asyncio.CancelledError:
+                self.release(model, tokens)
+                raise
+            except Exception as e:
+                self.release(model, tokens, status=_status(e) or 0)
+                if not self._should_retry(e, attempt):
+                    raise
+                await asyncio.sleep(self.backoff(attempt))
+                continue
+            self.release(model, tokens, used=_usage(result))
+            return result
+
+    def stream(self, fn: Callable[[], Iterator], model: str, tokens: int = 0) -> Iterator:
+        """Yield from fn() once admitted; retried only if it fails before the first chunk."""
+        for attempt in itertools.count():
+            self.acquire(model, tokens)
+            started, used, status = False, None, None
+            try:
+                for chunk in fn():
+                    started = True
+                    used = _usage(chunk) or used
+                    yield chunk
+                return
+            except Exception as e:
+                status = _status(e) or 0
+                if started or not self._should_retry(e, attempt):
+                    raise
+            finally:
+                self.release(model, tokens, used=used, status=status)
+            time.sleep(self.backoff(attempt))
+
+    async def astream(self, fn: Callable[[], AsyncIterator], model: str, tokens: int = 0) -> AsyncIterator:
+        for attempt in itertools.count():
+            await self.aacquire(model, tokens)
+            started, used, status = False, None, None
+            try:
+                async for chunk in fn():
+                    started = True
+                    used = _usage(chunk) or used
+                    yield chunk
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                status = _status(e) or 0
+                if started or not self._should_retry(e, attempt):
+                    raise
+            finally:
+                self.release(model, tokens, used=used, status=status)
+            await asyncio.sleep(self.backoff(attempt))
+
+    # Reporting
+
+    def stats(self) -> Dict:
+        with self._lock:
+            queued = {name: 0 for name in PRIORITIES}
+            for _, _, waiter in self._heap:
+                if not waiter.cancelled:
+                    queued[waiter.priority] += 1
+            return {
+                "queue_depth": queued,
+                "in_flight": self.in_flight,
+                "concurrency_limit": round(self.concurrency_limit, 2),
+                "wait_seconds": {
+                    name: {"count": int(count), "avg": round(total / count, 4) if count else 0.0, "max": round(longest, 4)}
+                    for name, (count, total, longest) in self._waits.items()
+                },
+                **self.counters,
+            }
+
+    def to_prometheus(self) -> str:
+        stats = self.stats()
+        lines = [
+            "# HELP gemini_scheduler_queue_depth Calls waiting for admission.",
+            "# TYPE gemini_scheduler_queue_depth gauge",
+        ]
+        lines += [f'gemini_scheduler_queue_depth{{priority="{name}"}} {depth}' for name, depth in stats["queue_depth"].items()]
+        lines += [
+            "# HELP gemini_scheduler_in_flight Calls currently running.",
+            "# TYPE gemini_scheduler_in_flight gauge",
+            f"gemini_scheduler_in_flight {stats['in_flight']}",
+            "# HELP gemini_scheduler_concurrency_limit Current adaptive concurrency limit.",
+            "# TYPE gemini_scheduler_concurrency_limit gauge",
+            f"gemini_scheduler_concurrency_limit {stats['concurrency_limit']}",
+            "# HELP gemini_scheduler_wait_seconds_total Time calls spent waiting for admission.",
+            "# TYPE gemini_scheduler_wait_seconds_total counter",
+        ]
+        lines += [f'gemini_scheduler_wait_seconds_total{{priority="{name}"}} {total:.6f}' for name, (_, total, _) in self._waits.items()]
+        for name in ("calls", "retries", "rate_limited", "server_errors", "failed"):
+            lines += [f"# TYPE gemini_scheduler_{name}_total counter", f"gemini_scheduler_{name}_total {stats[name]}"]
+        return "\n".join(lines) + "\n"
+
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+def _status(error: Exception) -> Optional[int]:
+    """HTTP status of a Gemini API or transport failure, else None.
+
+    agno raises ModelProviderError(status_code=502) for every exception, so
+    the status is taken from the google-genai error it was raised from, never
+    from the wrapper itself. Transport errors count as 503.
+    """
+    for cause in (error, error.__cause__):
+        if isinstance(cause, (ClientError, ServerError)):
+            return cause.code if isinstance(cause.code, int) else None
+        if isinstance(cause, TRANSPORT_ERRORS):
+            return TRANSPORT_ERROR_STATUS
+    return None
+
+
+def _usage(response: Any) -> Optional[int]:
+    """Total tokens reported by a google-genai response or stream chunk, if any."""
+    usage = getattr(response, "usage_metadata", None)
+    total = getattr(usage, "total_token_count", None) if usage is not None else None
+    return total if isinstance(total, int) else None
+
+
+def estimate_request_tokens(messages) -> int:
+    return sum(len(str(message.content or "")) for message in messages) // 4 + EXPECTED_OUTPUT_TOKENS
+
+
+@lru_cache(maxsize=None)
+def get_scheduler() -> GeminiScheduler:
+    """The process-wide scheduler, configured from the environment on first use."""
+    return GeminiScheduler(
+        rpm=float(os.getenv("GEMINI_RPM", "60")),
+        tpm=float(os.getenv("GEMINI_TPM", "1000000")),
+        max_concurrency=int(os.getenv("GEMINI_MAX_CONCURRENCY", "8")),
+    )
+
+
+class ScheduledModelMixin:
+    """Routes an agno model's invoke/ainvoke/stream calls through the process-wide scheduler."""
+
+    def invoke(self, messages, *args, **kwargs):
+        call = super().invoke
+        return get_scheduler().call(lambda: call(messages, *args, **kwargs), self.id, estimate_request_tokens(messages))
+
+    async def ainvoke(self, messages, *args, **kwargs):
+        call = super().ainvoke
+        return await get_scheduler().acall(lambda: call(messages, *args, **kwargs), self.id, estimate_request_tokens(messages))
+
+    def invoke_stream(self, messages, *args, **kwargs):
+        call = super().invoke_stream
+        yield from get_scheduler().stream(lambda: call(messages, *args, **kwargs), self.id, estimate_request_tokens(messages))
+
+    async def ainvoke_stream(self, messages, *args, **kwargs):
+        call = super().ainvoke_stream
+        async for chunk in get_scheduler().astream(lambda: call(messages, *args, **kwargs), self.id, estimate_request_tokens(messages)):
+            yield chunk
+
+
+class ScheduledGemini(ScheduledModelMixin, Gemini):
+    """Gemini model whose requests share the process-wide RPM/TPM quota and concurrency limit."""
@@ -0,0 +1,204 @@
+"""Per-run latency, token and tool-call metrics for team runs.
+
+agno already times every model call and tool call and stores the figures on
+the run response tree (the coordinator's TeamRunResponse plus one response
+per member run). collect_run_metrics walks that tree after a run and
+aggregates it per agent and per tool; MetricsRegistry accumulates runs for
+JSON and Prometheus export.
+"""
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+import json
+import threading
+
+
+@dataclass
+class ToolStats:
+    calls: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class AgentStats:
+    name: str
+    model_calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    model_seconds: float = 0.0
+    tool_seconds: float = 0.0
+    tools: Dict[str, ToolStats] = field(default_factory=dict)
+
+
+@dataclass
+class RunMetrics:
+    """Metrics for one team run. `agents` lists the coordinator first, then members."""
+    run_id: Optional[str]
+    wall_seconds: float
+    agents: List[AgentStats] = field(default_factory=list)
+    context_tokens_saved: int = 0
+
+    @property
+    def input_tokens(self) -> int:
+        return sum(agent.input_tokens for agent in self.agents)
+
+    @property
+    def output_tokens(self) -> int:
+        return sum(agent.output_tokens for agent in self.agents)
+
+    @property
+    def model_calls(self) -> int:
+        return sum(agent.model_calls for agent in self.agents)
+
+    def to_dict(self) -> Dict:
+        return {
+            "run_id": self.run_id,
+            "wall_seconds": self.wall_seconds,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "model_calls": self.model_calls,
+            "context_tokens_saved": self.context_tokens_saved,
+            "agents": [asdict(agent) for agent in self.agents],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+
+def collect_run_metrics(response, wall_seconds: float) -> RunMetrics:
+    """Aggregate an agno run response tree into RunMetrics.
+
+    Members that run more than once (e.g. re-delegated tasks) are merged
+    into one AgentStats entry.
+    """
+    metrics = RunMetrics(run_id=getattr(response, "run_id", None), wall_seconds=round(wall_seconds, 4))
+    by_name: Dict[str, AgentStats] = {}
+    pending = [response]
+    while pending:
+        current = pending.pop(0)
+        name = getattr(current, "agent_name", None) or getattr(current, "team_name", None) or "unknown"
+        if name not in by_name:
+            by_name[name] = AgentStats(name=name)
+            metrics.agents.append(by_name[name])
+        agent = by_name[name]
+
+        model_metrics = current.metrics or {}
+        agent.model_calls += len(model_metrics.get("input_tokens", []))
+        agent.input_tokens += sum(model_metrics.get("input_tokens", []))
+        agent.output_tokens += sum(model_metrics.get("output_tokens", []))
+        agent.model_seconds += sum(model_metrics.get("time", []))
+
+        for tool in current.tools or []:
+            tool_seconds = tool.metrics.time if tool.metrics is not None and tool.metrics.time else 0.0
+            stats = agent.tools.setdefault(tool.tool_name or "unknown", ToolStats())
+            stats.calls += 1
+            stats.errors += 1 if tool.tool_call_error else 0
+            stats.seconds += tool_seconds
+            agent.tool_seconds += tool_seconds
+
+        pending.extend(getattr(current, "member_responses", None) or [])
+    return metrics
+
+
+def format_summary_table(metrics: RunMetrics) -> str:
+    """Render a run's metrics as a fixed-width table for the CLI."""
+    lines = [
+        f"{'agent':<30}{'calls':>6}{'in tok':>9}{'out tok':>9}{'model s':>9}{'tool s':>9}  tools",
+        "-" * 90,
+    ]
+    for agent in metrics.agents:
+        tools = ", ".join(f"{name}×{stats.calls} ({stats.seconds:.2f}s)" for name, stats in agent.tools.items())
+        lines.append(
+            f"{agent.name[:29]:<30}{agent.model_calls:>6}{agent.input_tokens:>9}{agent.output_tokens:>9}"
+            f"{agent.model_seconds:>9.2f}{agent.tool_seconds:>9.2f}  {tools}"
+        )
+    lines.append("-" * 90)
+    lines.append(
+        f"{'total (wall ' + format(metrics.wall_seconds, '.2f') + 's)':<30}{metrics.model_calls:>6}"
+        f"{metrics.input_tokens:>9}{metrics.output_tokens:>9}"
+    )
+    if metrics.context_tokens_saved:
+        lines.append(f"context budget saved ~{metrics.context_tokens_saved} input tokens")
+    return "\n".join(lines)
+
+
+class MetricsRegistry:
+    """Process-wide accumulator of RunMetrics with Prometheus text export.
+
+    When jsonl_path is set, every recorded run is also appended there as one
+    JSON line.
+    """
+
+    def __init__(self, jsonl_path: Optional[str] = None):
+        self.jsonl_path = jsonl_path
+        self.runs = 0
+        self.run_seconds = 0.0
+        self.context_tokens_saved = 0
+        self.agents: Dict[str, AgentStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, metrics: RunMetrics):
+        with self._lock:
+            self.runs += 1
+            self.run_seconds += metrics.wall_seconds
+            self.context_tokens_saved += metrics.context_tokens_saved
+            for agent in metrics.agents:
+                total = self.agents.setdefault(agent.name, AgentStats(name=agent.name))
+                total.model_calls += agent.model_calls
+                total.input_tokens += agent.input_tokens
+                total.output_tokens += agent.output_tokens
+                total.model_seconds += agent.model_seconds
+                total.tool_seconds += agent.tool_seconds
+                for tool_name, stats in agent.tools.items():
+                    tool_total = total.tools.setdefault(tool_name, ToolStats())
+                    tool_total.calls += stats.calls
+                    tool_total.errors += stats.errors
+                    tool_total.seconds += stats.seconds
+            if self.jsonl_path:
+                with open(self.jsonl_path, "a", encoding="utf-8") as jsonl_file:
+                    jsonl_file.write(metrics.to_json() + "\n")
+
+    def to_prometheus(self) -> str:
+        """Render accumulated metrics in the Prometheus text exposition format."""
+        with self._lock:
+            lines = [
+                "# HELP linkedin_team_runs_total Completed team runs.",
+                "# TYPE linkedin_team_runs_total counter",
+                f"linkedin_team_runs_total {self.runs}",
+                "# HELP linkedin_team_run_seconds_total Wall time spent in team runs.",
+                "# TYPE linkedin_team_run_seconds_total counter",
+                f"linkedin_team_run_seconds_total {self.run_seconds:.6f}",
+                "# HELP linkedin_context_tokens_saved_total Tokens removed from replayed context by the context budget.",
+                "# TYPE linkedin_context_tokens_saved_total counter",
+                f"linkedin_context_tokens_saved_total {self.context_tokens_saved}",
+            ]
+            agent_series = [
+                ("linkedin_agent_model_calls_total", "Model round trips per agent.", lambda a: a.model_calls),
+                ("linkedin_agent_input_tokens_total", "Model input tokens per agent.", lambda a: a.input_tokens),
+                ("linkedin_agent_output_tokens_total", "Model output tokens per agent.", lambda a: a.output_tokens),
+                ("linkedin_agent_model_seconds_total", "Time spent waiting on the model per agent.", lambda a: a.model_seconds),
+                ("linkedin_agent_tool_seconds_total", "Time spent in tool calls per agent.", lambda a: a.tool_seconds),
+            ]
+            for metric_name, help_text, value in agent_series:
+                lines.append(f"# HELP {metric_name} {help_text}")
+                lines.append(f"# TYPE {metric_name} counter")
+                for agent in self.agents.values():
+                    lines.append(f'{metric_name}{{agent="{_label(agent.name)}"}} {value(agent)}')
+            tool_series = [
+                ("linkedin_tool_calls_total", "Tool calls.", lambda t: t.calls),
+                ("linkedin_tool_errors_total", "Tool calls that returned an error.", lambda t: t.errors),
+                ("linkedin_tool_seconds_total", "Time spent in tool calls.", lambda t: t.seconds),
+            ]
+            for metric_name, help_text, value in tool_series:
+                lines.append(f"# HELP {metric_name} {help_text}")
+                lines.append(f"# TYPE {metric_name} counter")
+                for agent in self.agents.values():
+                    for tool_name, stats in agent.tools.items():
+                        lines.append(
+                            f'{metric_name}{{agent="{_label(agent.name)}",tool="{_label(tool_name)}"}} {value(stats)}'
+                        )
+            return "\n".join(lines) + "\n"
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
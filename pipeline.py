@@ -0,0 +1,336 @@
+"""Deterministic staged pipeline: an alternative engine to the coordinate-mode team.
+
+The team's coordinator model always delegates in the same order (Insight
+Generator -> Content Architect -> Post Publisher), so this engine runs those
+agents as fixed stages and skips the coordinator round trips entirely:
+
+1. research   - Insight Generator researches trends, while the profile/company
+                lookups, hashtags and CTA are computed locally in parallel
+2. draft      - Content Architect writes the post from the research brief,
+                including compact profile and target company summaries
+3. publish    - Post Publisher queues visuals and adds a posting strategy (optional)
+
+StagedPipeline.variants runs stage 1 once and fans out stage 2 (and
+optionally 3) concurrently for N variants with different hooks and CTAs,
+for A/B testing at roughly the cost of one run plus N drafts.
+"""
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional
+import asyncio
+import time
+
+from team import (
+    analyze_linkedin_profile,
+    create_content_architect,
+    create_insight_generator,
+    create_networking_cta,
+    create_post_publisher,
+    generate_networking_hashtags,
+    get_company_index,
+)
+from visual_queue import collect_visual_jobs
+
+if TYPE_CHECKING:
+    from visual_queue import VisualJob
+
+DEFAULT_VARIANT_HOOKS = [
+    "Open with the concrete result or number",
+    "Open with a question aimed at peers at the target companies",
+    "Open with a short personal story from the experience",
+    "Open with a surprising or contrarian takeaway",
+    "Open with a mistake made along the way and what it taught",
+]
+VARIANT_CTA_TYPES = ["question", "insight", "achievement", "learning", "general"]
+
+
+@dataclass
+class ResearchBrief:
+    """Output of the research stage, shared by every later stage."""
+    insights: str
+    profile: Optional[Dict]
+    target_company_profiles: List[Dict]
+    hashtags: List[str]
+    cta: str
+    seconds: float = 0.0
+    usage: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class PipelineResult:
+    """Final output of a staged run with per-stage timings and model usage."""
+    research: ResearchBrief
+    post: str
+    publishing_plan: Optional[str]
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    usage: Dict[str, int] = field(default_factory=dict)
+    total_seconds: float = 0.0
+    visual_jobs: List["VisualJob"] = field(default_factory=list)
+
+
+@dataclass
+class PostVariant:
+    """One fanned-out draft; `hook` and `cta_type` are what set it apart from the others."""
+    hook: str
+    cta_type: str
+    cta: str
+    post: str
+    publishing_plan: Optional[str] = None
+    seconds: float = 0.0
+    usage: Dict[str, int] = field(default_factory=dict)
+    visual_jobs: List["VisualJob"] = field(default_factory=list)
+
+
+@dataclass
+class VariantsResult:
+    """Variants of one post together with the research they share."""
+    research: ResearchBrief
+    variants: List[PostVariant]
+    usage: Dict[str, int] = field(default_factory=dict)
+    total_seconds: float = 0.0
+
+
+def default_variant_specs(user_input: Dict, count: int) -> List[Dict[str, str]]:
+    """Pair a different hook with a different CTA style for each variant, starting with the user's content type."""
+    cta_types = [user_input["content_type"]] + [cta_type for cta_type in VARIANT_CTA_TYPES if cta_type != user_input["content_type"]]
+    return [
+        {"hook": DEFAULT_VARIANT_HOOKS[i % len(DEFAULT_VARIANT_HOOKS)], "cta_type": cta_types[i % len(cta_types)]}
+        for i in range(count)
+    ]
+
+
+def summarize_usage(*responses) -> Dict[str, int]:
+    """Sum tokens and model round trips over agno run responses, including member responses."""
+    usage = {"input_tokens": 0, "output_tokens": 0, "model_calls": 0}
+    pending = [response for response in responses if response is not None]
+    while pending:
+        response = pending.pop()
+        metrics = response.metrics or {}
+        usage["input_tokens"] += sum(metrics.get("input_tokens", []))
+        usage["output_tokens"] += sum(metrics.get("output_tokens", []))
+        usage["model_calls"] += len(metrics.get("input_tokens", []))
+        pending.extend(getattr(response, "member_responses", None) or [])
+    return usage
+
+
+def build_research_prompt(user_input: Dict) -> str:
+    profile = user_input["user_profile"]
+    return f"""
+    Research networking insights for a LinkedIn post.
+
+    USER: {profile['current_role']} at {profile['company']} ({profile['industry']}, {profile['experience_years']} years)
+    TARGET COMPANIES: {', '.join(user_input['target_companies'])}
+    CONTENT TYPE: {user_input['content_type']}
+    CONTENT DETAILS: {user_input['content_details']}
+    NETWORKING GOAL: {user_input['networking_goal']}
+
+    The user's profile and target company list are looked up separately and
+    given to the writer; focus on current trends at the target companies relevant to the content details,
+    networking angles and conversation starters. Reply with concise bullet points.
+    """
+
+
+def summarize_profile(profile: Optional[Dict]) -> str:
+    """One line from an ingested LinkedIn profile, or "" when none was ingested."""
+    if not profile or profile.get("status") == "not_ingested":
+        return ""
+    parts = [profile.get("headline")]
+    if profile.get("experience_years"):
+        parts.append(f"{profile['experience_years']} years experience")
+    previous = (profile.get("positions") or [])[1:3]
+    if previous:
+        parts.append("previously " + ", ".join(f"{position['title']} at {position['company']}" for position in previous))
+    if profile.get("skills"):
+        parts.append("skills: " + ", ".join(profile["skills"][:8]))
+    if profile.get("top_connection_companies"):
+        parts.append("most connections at: " + ", ".join(list(profile["top_connection_companies"])[:5]))
+    return "; ".join(part for part in parts if part)
+
+
+def summarize_companies(companies: List[Dict]) -> str:
+    """One line per company: name, industry and size, who to reach and what content works there."""
+    lines = []
+    for company in companies:
+        people = ", ".join(company.get("key_people") or [])
+        line = f"- {company['name']} ({company.get('industry', '')}, {company.get('size', '')})"
+        if people:
+            line += f"; key people: {people}"
+        if company.get("content_strategy"):
+            line += f"; resonates: {company['content_strategy']}"
+        lines.append(line)
+    return "\n    ".join(lines)
+
+
+def build_draft_prompt(user_input: Dict, research: ResearchBrief, hook: Optional[str] = None, cta: Optional[str] = None) -> str:
+    profile = user_input["user_profile"]
+    hook_line = f"HOOK: {hook}" if hook else ""
+    background = summarize_profile(research.profile)
+    background_line = f"AUTHOR BACKGROUND: {background}" if background else ""
+    companies = summarize_companies(research.target_company_profiles)
+    companies_block = f"TARGET COMPANY PROFILES:\n    {companies}" if companies else ""
+    return f"""
+    Write the LinkedIn post for {profile['name']}, {profile['current_role']} at {profile['company']}.
+    {background_line}
+
+    CONTENT TYPE: {user_input['content_type']}
+    CONTENT DETAILS: {user_input['content_details']}
+    NETWORKING GOAL: {user_input['networking_goal']}
+    {hook_line}
+
+    RESEARCH INSIGHTS:
+    {research.insights}
+
+    {companies_block}
+
+    Use this networking CTA (adapt wording if needed): {cta or research.cta}
+    Use these hashtags: {' '.join(research.hashtags)}
+
+    Reply with the final post text only.
+    """
+
+
+def build_publish_prompt(post: str) -> str:
+    return f"""
+    Queue a supporting visual if beneficial and provide a posting strategy
+    and timing recommendations for this LinkedIn post:
+
+    {post}
+    """
+
+
+class StagedPipeline:
+    """Runs the three agents as fixed stages with no coordinator model.
+
+    Like the team, a pipeline keeps per-run state on its agents, so use one
+    instance per concurrent run.
+    """
+
+    def __init__(self, include_publisher: bool = True):
+        self.insight_generator = create_insight_generator(with_lookups=False)
+        self.content_architect = create_content_architect(with_tools=False)
+        self.post_publisher = create_post_publisher() if include_publisher else None
+
+    def run(self, user_input: Dict) -> PipelineResult:
+        return asyncio.run(self.arun(user_input))
+
+    async def arun(self, user_input: Dict) -> PipelineResult:
+        run_start = time.perf_counter()
+        research = await self.research(user_input)
+        stage_seconds = {"research": research.seconds}
+
+        stage_start = time.perf_counter()
+        draft_response = await self.content_architect.arun(build_draft_prompt(user_input, research), stream=False)
+        stage_seconds["draft"] = round(time.perf_counter() - stage_start, 3)
+
+        publish_response = None
+        visual_jobs: List["VisualJob"] = []
+        if self.post_publisher is not None:
+            stage_start = time.perf_counter()
+            with collect_visual_jobs() as visual_jobs:
+                publish_response = await self.post_publisher.arun(build_publish_prompt(draft_response.content), stream=False)
+            stage_seconds["publish"] = round(time.perf_counter() - stage_start, 3)
+
+        return PipelineResult(
+            research=research,
+            post=draft_response.content,
+            publishing_plan=publish_response.content if publish_response is not None else None,
+            stage_seconds=stage_seconds,
+            usage=_add_usage(research.usage, summarize_usage(draft_response, publish_response)),
+            total_seconds=round(time.perf_counter() - run_start, 3),
+            visual_jobs=visual_jobs,
+        )
+
+    def variants(self, user_input: Dict, count: int = 3, specs: Optional[List[Dict[str, str]]] = None, include_visuals: bool = False) -> VariantsResult:
+        return asyncio.run(self.avariants(user_input, count, specs, include_visuals))
+
+    async def avariants(
+        self,
+        user_input: Dict,
+        count: int = 3,
+        specs: Optional[List[Dict[str, str]]] = None,
+        include_visuals: bool = False,
+    ) -> VariantsResult:
+        """Research once, then draft `count` variants concurrently.
+
+        `specs` overrides the default hook/CTA pairs; each is a dict with
+        "hook" and "cta_type" (a create_networking_cta content type). With
+        include_visuals, each variant also gets a publisher pass that queues
+        its visual.
+        """
+        specs = specs or default_variant_specs(user_input, count)
+        if not specs:
+            raise ValueError("count must be at least 1")
+        run_start = time.perf_counter()
+        research = await self.research(user_input)
+        variants = await asyncio.gather(*(self._variant(user_input, research, spec, include_visuals) for spec in specs))
+        return VariantsResult(
+            research=research,
+            variants=list(variants),
+            usage=_add_usage(research.usage, *(variant.usage for variant in variants)),
+            total_seconds=round(time.perf_counter() - run_start, 3),
+        )
+
+    async def _variant(self, user_input: Dict, research: ResearchBrief, spec: Dict[str, str], include_visuals: bool) -> PostVariant:
+        # Agents are not re-entrant, so every concurrent variant gets its own architect and publisher
+        stage_start = time.perf_counter()
+        cta = create_networking_cta(user_input["target_companies"], spec["cta_type"])
+        draft_response = await create_content_architect(with_tools=False).arun(
+            build_draft_prompt(user_input, research, hook=spec.get("hook"), cta=cta), stream=False
+        )
+        publish_response = None
+        visual_jobs: List["VisualJob"] = []
+        if include_visuals:
+            with collect_visual_jobs() as visual_jobs:
+                publish_response = await create_post_publisher().arun(build_publish_prompt(draft_response.content), stream=False)
+        return PostVariant(
+            hook=spec.get("hook", ""),
+            cta_type=spec["cta_type"],
+            cta=cta,
+            post=draft_response.content,
+            publishing_plan=publish_response.content if publish_response is not None else None,
+            seconds=round(time.perf_counter() - stage_start, 3),
+            usage=summarize_usage(draft_response, publish_response),
+            visual_jobs=visual_jobs,
+        )
+
+    async def research(self, user_input: Dict) -> ResearchBrief:
+        """Run the research agent and the local lookups concurrently."""
+        stage_start = time.perf_counter()
+        profile = user_input["user_profile"]
+        targets = user_input["target_companies"]
+        linkedin_url = profile.get("linkedin_url")
+
+        (
+            research_response,
+            analyzed_profile,
+            company_profiles,
+            hashtags,
+            cta,
+        ) = await asyncio.gather(
+            self.insight_generator.arun(build_research_prompt(user_input), stream=False),
+            asyncio.to_thread(analyze_linkedin_profile, linkedin_url) if linkedin_url else _none(),
+            asyncio.to_thread(lambda: get_company_index().lookup(targets)),
+            asyncio.to_thread(generate_networking_hashtags, targets, profile["industry"]),
+            asyncio.to_thread(create_networking_cta, targets, user_input["content_type"]),
+        )
+
+        return ResearchBrief(
+            insights=research_response.content,
+            profile=analyzed_profile,
+            target_company_profiles=company_profiles,
+            hashtags=hashtags,
+            cta=cta,
+            seconds=round(time.perf_counter() - stage_start, 3),
+            usage=summarize_usage(research_response),
+        )
+
+
+async def _none():
+    return None
+
+
+def _add_usage(*usages: Dict[str, int]) -> Dict[str, int]:
+    total: Dict[str, int] = {}
+    for usage in usages:
+        for key, value in usage.items():
+            total[key] = total.get(key, 0) + value
+    return total
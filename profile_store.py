@@ -0,0 +1,244 @@
+"""Profiles parsed from LinkedIn data-export archives, served to analyze_linkedin_profile.
+
+A LinkedIn export is a ZIP of CSVs (Profile, Positions, Skills, Education,
+Connections). parse_export reads each CSV row by row straight out of the
+archive, so even a large Connections.csv is never held in memory; connections
+are reduced to counts as they stream past. The compact result is stored in a
+ProfileStore keyed on the normalized profile URL and the archive's sha256, so
+an unchanged export is never parsed again, and an unchanged file (same size
+and mtime) is not even re-hashed. Only the latest export's profile is kept
+per URL; ingesting a changed export deletes the one it replaces.
+
+Bulk ingestion: python -m profile_store manifest.csv [--workers 4]
+where manifest.csv has linkedin_url,export_path columns.
+"""
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import argparse
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+import zipfile
+
+from sqlite_store import SQLiteStore
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "profiles.sqlite")
+
+TOP_SKILLS = 30
+TOP_POSITIONS = 5
+TOP_CONNECTION_COMPANIES = 15
+SUMMARY_CHARS = 600
+
+
+def normalize_profile_url(url: str) -> str:
+    """linkedin.com/in/<handle> form: no scheme, www, query or trailing slash, lowercased."""
+    url = re.sub(r"^[a-z]+://", "", url.strip().casefold())
+    url = re.sub(r"^(www\.|[a-z]{2}\.)(?=linkedin\.com)", "", url)
+    return url.split("?")[0].split("#")[0].rstrip("/")
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as export_file:
+        for chunk in iter(lambda: export_file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _iter_csv(archive: zipfile.ZipFile, name: str, header_starts_with: Optional[str] = None) -> Iterator[Dict[str, str]]:
+    """Stream rows of the archive member whose file name is `name` (any folder, any case).
+
+    Connections.csv opens with a few "Notes:" lines; rows before the one
+    starting with header_starts_with are skipped.
+    """
+    member = next((info for info in archive.infolist() if os.path.basename(info.filename).casefold() == name), None)
+    if member is None:
+        return
+    with archive.open(member) as raw:
+        reader = csv.reader(io.TextIOWrapper(raw, encoding="utf-8-sig", newline=""))
+        header = None
+        for row in reader:
+            if header is None:
+                if row and (header_starts_with is None or row[0].strip() == header_starts_with):
+                    header = [column.strip() for column in row]
+                continue
+            if row:
+                yield dict(zip(header, row))
+
+
+def _year(text: str) -> Optional[int]:
+    match = re.search(r"\b(19|20)\d{2}\b", text or "")
+    return int(match.group(0)) if match else None
+
+
+def parse_export(path: str) -> Dict:
+    """Reduce a LinkedIn export ZIP to the compact profile served to the agents."""
+    with zipfile.ZipFile(path) as archive:
+        profile = next(_iter_csv(archive, "profile.csv"), {})
+
+        positions: List[Dict] = []
+        earliest_start = None
+        for row in _iter_csv(archive, "positions.csv"):
+            start = _year(row.get("Started On", ""))
+            if start is not None:
+                earliest_start = start if earliest_start is None else min(earliest_start, start)
+            if len(positions) < TOP_POSITIONS:
+                positions.append({
+                    "title": row.get("Title", ""),
+                    "company": row.get("Company Name", ""),
+                    "started": row.get("Started On", ""),
+                    "finished": row.get("Finished On", ""),
+                })
+
+        skills = []
+        for row in _iter_csv(archive, "skills.csv"):
+            if len(skills) >= TOP_SKILLS:
+                break
+            if row.get("Name"):
+                skills.append(row["Name"])
+
+        education = [
+            " - ".join(part for part in (row.get("School Name"), row.get("Degree Name")) if part)
+            for row in _iter_csv(archive, "education.csv")
+        ]
+
+        connection_count = 0
+        connection_companies: Counter = Counter()
+        connections_by_year: Counter = Counter()
+        for row in _iter_csv(archive, "connections.csv", header_starts_with="First Name"):
+            connection_count += 1
+            if row.get("Company"):
+                connection_companies[row["Company"]] += 1
+            connected_year = _year(row.get("Connected On", ""))
+            if connected_year is not None:
+                connections_by_year[connected_year] += 1
+
+    current = next((position for position in positions if not position["finished"]), positions[0] if positions else {})
+    name = " ".join(part for part in (profile.get("First Name"), profile.get("Last Name")) if part)
+    recent_year = max(connections_by_year) if connections_by_year else None
+    return {
+        "name": name,
+        "headline": profile.get("Headline", ""),
+        "current_role": current.get("title", ""),
+        "company": current.get("company", ""),
+        "industry": profile.get("Industry", ""),
+        "location": profile.get("Geo Location", ""),
+        "summary": (profile.get("Summary") or "")[:SUMMARY_CHARS],
+        "experience_years": date.today().year - earliest_start if earliest_start else None,
+        "positions": positions,
+        "skills": skills,
+        "education": "; ".join(education),
+        "connection_count": connection_count,
+        "top_connection_companies": dict(connection_companies.most_common(TOP_CONNECTION_COMPANIES)),
+        "recent_activity": f"{connections_by_year[recent_year]} new connections in {recent_year}" if recent_year else "",
+    }
+
+
+class ProfileStore:
+    """Parsed profiles keyed by URL + export hash, with a per-URL pointer to the latest one."""
+
+    def __init__(self, store: Optional[SQLiteStore] = None):
+        # Ingested profiles are the source of truth, not a cache: no TTL and no eviction
+        self.store = store if store is not None else SQLiteStore(path=os.getenv("PROFILE_CACHE_PATH", DEFAULT_CACHE_PATH))
+        self.parsed = 0
+        self.unchanged = 0
+        self._lock = threading.Lock()
+
+    def ingest(self, linkedin_url: str, export_path: str) -> Dict:
+        """Make the export available for linkedin_url, parsing it only if its contents changed."""
+        url = normalize_profile_url(linkedin_url)
+        digest = self._digest(url, export_path)
+        key = f"profile:{url}:{digest}"
+        profile = self.store.get(key)
+        if profile is None:
+            profile = json.dumps(dict(parse_export(export_path), linkedin_url=url), separators=(",", ":"))
+            self.store.set(key, profile)
+            with self._lock:
+                self.parsed += 1
+        else:
+            with self._lock:
+                self.unchanged += 1
+        self._point_latest(url, key)
+        return json.loads(profile)
+
+    def _point_latest(self, url: str, key: str):
+        """Make key the URL's current profile and delete the profile it supersedes."""
+        previous = self.store.get(f"latest:{url}")
+        self.store.set(f"latest:{url}", key)
+        if previous is not None and previous != key:
+            self.store.delete(previous)
+
+    def _digest(self, url: str, export_path: str) -> str:
+        """sha256 of the export, reused without reading the file when its path, size and mtime are unchanged.
+
+        One stat entry per URL, overwritten when the export changes.
+        """
+        stat = os.stat(export_path)
+        signature = f"{os.path.abspath(export_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+        cached = self.store.get(f"stat:{url}")
+        if cached is not None:
+            cached_signature, _, digest = cached.rpartition("|")
+            if cached_signature == signature:
+                return digest
+        digest = file_sha256(export_path)
+        self.store.set(f"stat:{url}", f"{signature}|{digest}")
+        return digest
+
+    def ingest_many(self, exports: Iterable[Tuple[str, str]], workers: int = 1) -> Dict:
+        """Ingest (linkedin_url, export_path) pairs; changed exports are parsed in `workers` processes."""
+        pending = []
+        for linkedin_url, export_path in exports:
+            url = normalize_profile_url(linkedin_url)
+            key = f"profile:{url}:{self._digest(url, export_path)}"
+            if self.store.get(key) is None:
+                pending.append((url, export_path, key))
+            else:
+                with self._lock:
+                    self.unchanged += 1
+                self._point_latest(url, key)
+
+        def store_parsed(url: str, key: str, profile: Dict):
+            self.store.set(key, json.dumps(dict(profile, linkedin_url=url), separators=(",", ":")))
+            self._point_latest(url, key)
+            with self._lock:
+                self.parsed += 1
+
+        if workers > 1 and len(pending) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for (url, _, key), profile in zip(pending, executor.map(parse_export, [path for _, path, _ in pending])):
+                    store_parsed(url, key, profile)
+        else:
+            for url, export_path, key in pending:
+                store_parsed(url, key, parse_export(export_path))
+        return self.stats()
+
+    def get(self, linkedin_url: str) -> Optional[Dict]:
+        """Latest ingested profile for the URL, or None if no export was ingested."""
+        key = self.store.get(f"latest:{normalize_profile_url(linkedin_url)}")
+        profile = self.store.get(key) if key is not None else None
+        return json.loads(profile) if profile is not None else None
+
+    def stats(self) -> Dict:
+        return {"parsed": self.parsed, "unchanged": self.unchanged}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("manifest", help="CSV with linkedin_url,export_path columns")
+    parser.add_argument("--workers", type=int, default=1, help="processes used to parse changed exports")
+    args = parser.parse_args()
+
+    with open(args.manifest, newline="", encoding="utf-8") as manifest_file:
+        exports = [(row["linkedin_url"], row["export_path"]) for row in csv.DictReader(manifest_file)]
+    stats = ProfileStore().ingest_many(exports, workers=args.workers)
+    print(f"✅ {len(exports)} exports: {stats['parsed']} parsed, {stats['unchanged']} unchanged")
+
+
+if __name__ == "__main__":
+    main()
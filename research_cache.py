@@ -0,0 +1,123 @@
+from agno.tools.duckduckgo import DuckDuckGoTools
+from context_budget import current_budget, minify_json
+from sqlite_store import SQLiteStore
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional
+import os
+import re
+import threading
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "research.sqlite")
+
+
+def normalize_query(query: str) -> str:
+    """Canonical cache key form of a search query: case-folded, whitespace collapsed, trailing punctuation dropped.
+
+    Token order and operators such as -term, "phrase" or site: are kept, since
+    they change what the search returns.
+    """
+    return re.sub(r"[\s.,;:!?]+$", "", " ".join(query.casefold().split()))
+
+
+class ResearchCache(SQLiteStore):
+    """SQLiteStore with the research cache's defaults: 6 hour TTL, 5000 entries."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_seconds: float = 6 * 3600, max_entries: int = 5000):
+        super().__init__(path, ttl_seconds, max_entries)
+
+
+class CachedDuckDuckGoTools(DuckDuckGoTools):
+    """DuckDuckGoTools that serves repeated queries from a persistent cache.
+
+    Identical queries that are in flight at the same time are merged into a
+    single DDG request. Results are stored as minified JSON and cut down to
+    the active ContextBudget, if any, before they reach the model.
+    """
+
+    def __init__(self, cache: Optional[ResearchCache] = None, **kwargs):
+        self.cache = cache if cache is not None else ResearchCache(path=os.getenv("RESEARCH_CACHE_PATH", DEFAULT_CACHE_PATH))
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._in_flight: Dict[str, Future] = {}
+        self._in_flight_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def _cached(self, kind: str, query: str, max_results: int, fetch: Callable[[], str]) -> str:
+        actual_max_results = self.fixed_max_results or max_results
+        key = f"{kind}|{self.modifier or ''}|{actual_max_results}|{normalize_query(query)}"
+
+        cached = self.cache.get(key)
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            if cached is None and future is None:
+                # The leader for this key may have stored its result and left since the read above
+                cached = self.cache.get(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = minify_json(fetch())
+            self.cache.set(key, result)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._in_flight_lock:
+                self._in_flight.pop(key, None)
+
+    def _fit(self, result: str) -> str:
+        budget = current_budget.get()
+        return budget.fit_tool_result(result) if budget is not None else result
+
+    def duckduckgo_search(self, query: str, max_results: int = 5) -> str:
+        """Use this function to search DuckDuckGo for a query.
+
+        Args:
+            query(str): The query to search for.
+            max_results (optional, default=5): The maximum number of results to return.
+
+        Returns:
+            The result from DuckDuckGo.
+        """
+        return self._fit(self._cached(
+            "text", query, max_results, lambda: super(CachedDuckDuckGoTools, self).duckduckgo_search(query, max_results)
+        ))
+
+    def duckduckgo_news(self, query: str, max_results: int = 5) -> str:
+        """Use this function to get the latest news from DuckDuckGo.
+
+        Args:
+            query(str): The query to search for.
+            max_results (optional, default=5): The maximum number of results to return.
+
+        Returns:
+            The latest news from DuckDuckGo.
+        """
+        return self._fit(self._cached(
+            "news", query, max_results, lambda: super(CachedDuckDuckGoTools, self).duckduckgo_news(query, max_results)
+        ))
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters for the research cache."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+            "entries": len(self.cache),
+        }
@@ -0,0 +1,90 @@
+from sqlite_store import SQLiteStore
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional
+import hashlib
+import json
+import os
+import threading
+
+if TYPE_CHECKING:
+    from agno.run.team import TeamRunResponse
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "responses.sqlite")
+
+# What LinkedInContentCreator.build_prompt renders; nothing else may affect the cache key
+PROMPT_FIELDS = ("target_companies", "content_type", "content_details", "networking_goal")
+PROFILE_PROMPT_FIELDS = ("name", "current_role", "company", "industry", "experience_years", "linkedin_url")
+
+
+def canonicalize_user_input(value: Any, field: Optional[str] = None) -> Any:
+    """Normalize a user_input dict so trivially different submissions compare equal.
+
+    Strings are case-folded with whitespace collapsed, and target_companies
+    is treated as an unordered set.
+    """
+    if isinstance(value, dict):
+        return {key: canonicalize_user_input(item, key) for key, item in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        items = [canonicalize_user_input(item) for item in value]
+        if field == "target_companies":
+            items = sorted(set(item for item in items if item))
+        return items
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    return value
+
+
+def prompt_inputs(user_input: Dict) -> Dict:
+    """The part of user_input the team prompt is built from, so ids and unused keys do not split cache entries."""
+    profile = user_input.get("user_profile") or {}
+    inputs = {field: user_input.get(field) for field in PROMPT_FIELDS}
+    inputs["user_profile"] = {field: profile.get(field) for field in PROFILE_PROMPT_FIELDS}
+    # build_prompt renders a missing and an empty linkedin_url the same way
+    inputs["user_profile"]["linkedin_url"] = profile.get("linkedin_url") or None
+    return inputs
+
+
+class ResponseCache:
+    """Persistent cache of full team runs keyed on canonical user input and model ids."""
+
+    def __init__(self, store: Optional[SQLiteStore] = None, ttl_seconds: float = 24 * 3600, max_entries: int = 1000):
+        self.store = store if store is not None else SQLiteStore(
+            path=os.getenv("RESPONSE_CACHE_PATH", DEFAULT_CACHE_PATH), ttl_seconds=ttl_seconds, max_entries=max_entries
+        )
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def key(self, user_input: Dict, model_ids: Iterable[str]) -> str:
+        payload = {"user_input": canonicalize_user_input(prompt_inputs(user_input)), "models": sorted(model_ids)}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional["TeamRunResponse"]:
+        """Return the cached run for key, or None on a miss."""
+        from agno.run.team import TeamRunResponse
+
+        cached = self.store.get(key)
+        response = None
+        if cached is not None:
+            try:
+                response = TeamRunResponse.from_dict(json.loads(cached))
+            except Exception:
+                response = None
+        with self._lock:
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return response
+
+    def set(self, key: str, response: "TeamRunResponse"):
+        self.store.set(key, json.dumps(response.to_dict(), default=str))
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters for the response cache."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self.store),
+        }
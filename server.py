@@ -0,0 +1,410 @@
+"""Long-running HTTP service for LinkedInContentCreator.
+
+Keeps `concurrency` warm teams (one per worker, since agno runs are not
+re-entrant) and feeds them from a bounded request queue:
+
+- POST /generate         body: user_input JSON; add ?stream=1 for NDJSON chunks
+- POST /variants         body: user_input JSON; ?n=3 variants sharing one research pass,
+                         ?visuals=1 to also queue a visual per variant
+- GET  /visuals/<job_id> status of a queued post visual
+- GET  /health           queue depth, in-flight runs and counters, plus Gemini scheduler stats
+- GET  /metrics          Prometheus text from the shared MetricsRegistry and Gemini scheduler
+
+When the queue is full new requests get 429 with Retry-After. If the client
+disconnects, its request is dropped from the queue or its run is cancelled.
+Built on asyncio streams, so it needs nothing beyond the project's own
+dependencies; every response closes the connection.
+
+Usage: python -m server [--host 127.0.0.1] [--port 8080] [--concurrency 4] [--queue-size 32] [--offline]
+(--offline serves the stub model and search backend from benchmarks/stubs.py)
+"""
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+import argparse
+import asyncio
+import json
+import time
+
+if TYPE_CHECKING:
+    from pipeline import VariantsResult
+    from team import LinkedInContentCreator
+
+MAX_BODY_BYTES = 1 << 20
+MAX_VARIANTS = 5
+INPUT_FIELDS = ("user_profile", "target_companies", "content_type", "content_details", "networking_goal")
+PROFILE_FIELDS = ("name", "current_role", "company", "industry", "experience_years")
+HEADER_TIMEOUT_SECONDS = 10
+
+
+class QueueFull(Exception):
+    pass
+
+
+class _Job:
+    """One queued request; `chunks` is set for streaming requests, `variants` for /variants requests."""
+
+    def __init__(self, user_input: Dict, stream: bool, variants: Optional[Dict] = None):
+        self.user_input = user_input
+        self.variants = variants
+        self.result: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.chunks: Optional[asyncio.Queue] = asyncio.Queue(maxsize=100) if stream else None
+        self.task: Optional[asyncio.Task] = None
+        self.cancelled = False
+        self.enqueued_at = time.perf_counter()
+
+    def cancel(self):
+        self.cancelled = True
+        if self.task is not None:
+            self.task.cancel()
+
+
+class ContentService:
+    """Warm worker pool with a bounded queue in front of it."""
+
+    def __init__(self, concurrency: int = 4, queue_size: int = 32):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.creators: List["LinkedInContentCreator"] = []
+        self.workers: List[asyncio.Task] = []
+        self.in_flight = 0
+        self.counters = {"accepted": 0, "rejected": 0, "completed": 0, "failed": 0, "cancelled": 0}
+        self.queue_wait_seconds = 0.0
+
+    async def start(self):
+        """Build the teams up front so the first request does not pay for it."""
+        import team
+
+        self.creators = await asyncio.to_thread(
+            lambda: [team.LinkedInContentCreator()] + [self._new_creator() for _ in range(self.concurrency - 1)]
+        )
+        self.workers = [asyncio.create_task(self._worker(index)) for index in range(self.concurrency)]
+
+    async def stop(self):
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+
+    @staticmethod
+    def _new_creator() -> "LinkedInContentCreator":
+        import team
+        return team.LinkedInContentCreator(team=team.create_linkedin_content_team())
+
+    def submit(self, user_input: Dict, stream: bool = False, variants: Optional[Dict] = None) -> _Job:
+        """Queue a request, or raise QueueFull when every worker is busy and queue_size requests are waiting."""
+        # Counted against workers + queue rather than asyncio.Queue(maxsize) so a burst
+        # arriving before idle workers have picked anything up is not rejected early
+        if self.queue.qsize() + self.in_flight >= self.concurrency + self.queue_size:
+            self.counters["rejected"] += 1
+            raise QueueFull()
+        job = _Job(user_input, stream, variants)
+        self.queue.put_nowait(job)
+        self.counters["accepted"] += 1
+        return job
+
+    async def _worker(self, index: int):
+        while True:
+            job: _Job = await self.queue.get()
+            if job.cancelled:
+                self.counters["cancelled"] += 1
+                continue
+            self.queue_wait_seconds += time.perf_counter() - job.enqueued_at
+            self.in_flight += 1
+            job.task = asyncio.create_task(self._execute(self.creators[index], job))
+            try:
+                await job.task
+            except asyncio.CancelledError:
+                if not job.cancelled:
+                    raise
+                self.counters["cancelled"] += 1
+                # The cancelled run may have left state on the team; start the next one clean
+                self.creators[index] = await asyncio.to_thread(self._new_creator)
+            finally:
+                self.in_flight -= 1
+
+    async def _execute(self, creator: "LinkedInContentCreator", job: _Job):
+        try:
+            if job.variants is not None:
+                from pipeline import StagedPipeline
+                result = await StagedPipeline(include_publisher=False).avariants(
+                    job.user_input, job.variants["count"], include_visuals=job.variants["visuals"]
+                )
+                job.result.set_result(variants_payload(result))
+            elif job.chunks is not None:
+                async for chunk in creator.astream_networking_content(job.user_input):
+                    await job.chunks.put(chunk)
+            else:
+                response = await creator.acreate_networking_content(job.user_input)
+                job.result.set_result({
+                    "content": response.content,
+                    "run_id": response.run_id,
+                    "cached": creator.last_run_metrics is None,
+                    "metrics": creator.last_run_metrics.to_dict() if creator.last_run_metrics is not None else None,
+                    "visual_jobs": [visual.to_dict() for visual in creator.last_visual_jobs],
+                })
+            self.counters["completed"] += 1
+        except Exception as e:
+            self.counters["failed"] += 1
+            if job.chunks is None:
+                job.result.set_exception(e)
+                return
+            await job.chunks.put({"type": "error", "error": f"{type(e).__name__}: {e}"})
+        if job.chunks is not None:
+            await job.chunks.put(None)
+
+    def health(self) -> Dict:
+        started = self.counters["completed"] + self.counters["failed"] + self.in_flight
+        return {
+            "status": "ok",
+            "workers": self.concurrency,
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.queue_size,
+            "in_flight": self.in_flight,
+            "avg_queue_wait_seconds": round(self.queue_wait_seconds / started, 3) if started else 0.0,
+            **self.counters,
+        }
+
+
+class ContentServer:
+    """Minimal HTTP/1.1 front end for ContentService on asyncio streams."""
+
+    def __init__(self, service: ContentService):
+        self.service = service
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await asyncio.wait_for(self._read_request(reader), HEADER_TIMEOUT_SECONDS)
+            if request is None:
+                return
+            method, path, query, body = request
+            await self._route(method, path, query, body, reader, writer)
+        except _HTTPError as e:
+            await self._send_json(writer, e.status, {"error": e.message})
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+            pass
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        try:
+            method, target, _ = request_line.decode("latin-1").split()
+        except ValueError:
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, "malformed request line")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, "invalid Content-Length")
+        if length < 0:
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, "invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise _HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "request body too large")
+        body = await reader.readexactly(length) if length else b""
+        url = urlsplit(target)
+        return method.upper(), url.path, parse_qs(url.query), body
+
+    async def _route(self, method: str, path: str, query: Dict, body: bytes, reader, writer):
+        if path == "/health" and method == "GET":
+            from gemini_scheduler import get_scheduler
+            return await self._send_json(writer, HTTPStatus.OK, dict(self.service.health(), gemini=get_scheduler().stats()))
+        if path == "/metrics" and method == "GET":
+            import team
+            from gemini_scheduler import get_scheduler
+            text = team.get_metrics_registry().to_prometheus() + get_scheduler().to_prometheus()
+            return await self._send(writer, HTTPStatus.OK, text.encode(), "text/plain; version=0.0.4")
+        if path.startswith("/visuals/") and method == "GET":
+            import team
+            job = team.get_visual_queue().get(path.rsplit("/", 1)[-1])
+            if job is None:
+                raise _HTTPError(HTTPStatus.NOT_FOUND, "unknown visual job")
+            return await self._send_json(writer, HTTPStatus.OK, job.to_dict())
+        if path not in ("/generate", "/variants"):
+            raise _HTTPError(HTTPStatus.NOT_FOUND, "not found")
+        if method != "POST":
+            raise _HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "use POST")
+
+        try:
+            user_input = json.loads(body)
+        except ValueError:
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, "body must be user_input JSON")
+        error = validate_user_input(user_input)
+        if error:
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, error)
+
+        variants = None
+        if path == "/variants":
+            try:
+                count = int(query.get("n", ["3"])[0])
+            except ValueError:
+                raise _HTTPError(HTTPStatus.BAD_REQUEST, "n must be an integer")
+            if not 1 <= count <= MAX_VARIANTS:
+                raise _HTTPError(HTTPStatus.BAD_REQUEST, f"n must be between 1 and {MAX_VARIANTS}")
+            variants = {"count": count, "visuals": _flag(query, "visuals")}
+        stream = variants is None and _flag(query, "stream")
+        try:
+            job = self.service.submit(user_input, stream=stream, variants=variants)
+        except QueueFull:
+            return await self._send_json(writer, HTTPStatus.TOO_MANY_REQUESTS, {"error": "queue full"}, {"Retry-After": "1"})
+
+        disconnect = asyncio.create_task(_wait_for_disconnect(reader))
+        try:
+            if stream:
+                await self._stream(job, disconnect, writer)
+            else:
+                done, _ = await asyncio.wait({job.result, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+                if job.result not in done:
+                    job.cancel()
+                    return
+                if job.result.exception() is not None:
+                    error = job.result.exception()
+                    return await self._send_json(writer, HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(error).__name__}: {error}"})
+                await self._send_json(writer, HTTPStatus.OK, job.result.result())
+        except ConnectionError:
+            job.cancel()
+        finally:
+            disconnect.cancel()
+
+    async def _stream(self, job: _Job, disconnect: asyncio.Task, writer: asyncio.StreamWriter):
+        """Send chunks as NDJSON over chunked transfer encoding."""
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+            b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n"
+        )
+        await writer.drain()
+        while True:
+            next_chunk = asyncio.ensure_future(job.chunks.get())
+            done, _ = await asyncio.wait({next_chunk, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+            if next_chunk not in done:
+                next_chunk.cancel()
+                job.cancel()
+                return
+            chunk = next_chunk.result()
+            if chunk is None:
+                break
+            line = (json.dumps(chunk, ensure_ascii=False) + "\n").encode("utf-8")
+            writer.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def _send_json(self, writer, status: HTTPStatus, payload: Dict, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        await self._send(writer, status, body, "application/json", headers)
+
+    async def _send(self, writer, status: HTTPStatus, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None):
+        head = [f"HTTP/1.1 {status.value} {status.phrase}", f"Content-Type: {content_type}", f"Content-Length: {len(body)}", "Connection: close"]
+        head += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def validate_user_input(user_input) -> Optional[str]:
+    """Why user_input cannot be rendered by LinkedInContentCreator.build_prompt, or None if it can."""
+    if not isinstance(user_input, dict):
+        return "body must be a JSON object"
+    missing = [field for field in INPUT_FIELDS if field not in user_input]
+    if missing:
+        return f"missing fields: {', '.join(missing)}"
+    profile = user_input["user_profile"]
+    if not isinstance(profile, dict):
+        return "user_profile must be an object"
+    missing = [field for field in PROFILE_FIELDS if field not in profile]
+    if missing:
+        return f"missing user_profile fields: {', '.join(missing)}"
+    targets = user_input["target_companies"]
+    if not isinstance(targets, list) or not all(isinstance(company, str) for company in targets):
+        return "target_companies must be a list of company names"
+    return None
+
+
+def _flag(query: Dict, name: str) -> bool:
+    return query.get(name, ["0"])[0].lower() in ("1", "true", "yes")
+
+
+def variants_payload(result: "VariantsResult") -> Dict:
+    research = result.research
+    return {
+        "research": {
+            "insights": research.insights,
+            "target_company_profiles": research.target_company_profiles,
+            "hashtags": research.hashtags,
+            "seconds": research.seconds,
+            "usage": research.usage,
+        },
+        "variants": [
+            {
+                "hook": variant.hook,
+                "cta_type": variant.cta_type,
+                "cta": variant.cta,
+                "post": variant.post,
+                "publishing_plan": variant.publishing_plan,
+                "seconds": variant.seconds,
+                "usage": variant.usage,
+                "visual_jobs": [visual.to_dict() for visual in variant.visual_jobs],
+            }
+            for variant in result.variants
+        ],
+        "usage": result.usage,
+        "total_seconds": result.total_seconds,
+    }
+
+
+async def _wait_for_disconnect(reader: asyncio.StreamReader):
+    """Return once the client closes its side of the connection."""
+    while await reader.read(1024):
+        pass
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8080, concurrency: int = 4, queue_size: int = 32):
+    service = ContentService(concurrency, queue_size)
+    await service.start()
+    server = await asyncio.start_server(ContentServer(service).handle, host, port)
+    print(f"🚀 Serving on http://{host}:{port} ({concurrency} workers, queue of {queue_size})", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--concurrency", type=int, default=4, help="warm teams running requests in parallel")
+    parser.add_argument("--queue-size", type=int, default=32, help="waiting requests before answering 429")
+    parser.add_argument("--offline", action="store_true", help="use the stub model and search backend")
+    args = parser.parse_args()
+
+    if args.offline:
+        from benchmarks.stubs import install_stubs
+        install_stubs()
+    try:
+        asyncio.run(serve(args.host, args.port, args.concurrency, args.queue_size))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
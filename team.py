@@ -1,75 +1,58 @@
-
-from agno.agent import Agent
-from agno.models.google import Gemini
-from agno.team import Team
-from agno.tools.duckduckgo import DuckDuckGoTools
-from agno.tools.models.gemini import GeminiTools
-from agno.tools import tool
-from typing import Dict, List, Optional
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Iterator, List, Optional
+import asyncio
 import json
 import re
-# --- ADDED: dotenv import and load ---
-from dotenv import load_dotenv
+import time
 import os
-load_dotenv()
-# --- END ADDED ---
+
+# agno, google-genai and ddgs are imported inside the factories below so that
+# importing this module stays cheap; nothing is built until first use.
+if TYPE_CHECKING:
+    from agno.agent import Agent
+    from agno.models.google import Gemini
+    from agno.team import Team
+    from google.genai import Client
+    from research_cache import CachedDuckDuckGoTools
+    from response_cache import ResponseCache
+    from instrumentation import MetricsRegistry
+    from context_budget import ContextBudget
+    from visual_queue import VisualJob, VisualQueue
+    from company_index import CompanyIndex
+    from profile_store import ProfileStore
+
+MODEL_ID = "gemini-2.0-flash-exp"
+# Per-run token budget for replayed team context and tool results; 0 disables it
+DEFAULT_CONTEXT_BUDGET_TOKENS = int(os.getenv("CONTEXT_BUDGET_TOKENS", "8000"))
 
 # Custom tools for LinkedIn content creation and networking
-@tool
 def analyze_linkedin_profile(linkedin_url: str) -> Dict:
-    """Analyze LinkedIn profile to understand user's background and networking potential."""
-    # In real implementation, this would scrape LinkedIn profile data
-    # For demo purposes, we'll simulate profile analysis
-    
-    profile_data = {
-        "name": "User Name",
-        "current_role": "Software Engineer",
-        "company": "Tech Company",
-        "industry": "Technology",
-        "experience_years": 5,
-        "skills": ["Python", "Machine Learning", "Data Science"],
-        "education": "Computer Science",
-        "connection_count": 500,
-        "recent_activity": "Active in AI and tech discussions"
-    }
+    """Analyze LinkedIn profile to understand user's background and networking potential.
     
-    return profile_data
-
-@tool
-def identify_target_companies(industry: str, role: str, location: str = "Global") -> List[Dict]:
-    """Identify target companies for networking based on user's profile and goals."""
-    
-    # Sample target companies (in real implementation, use company databases/APIs)
-    target_companies = [
-        {
-            "name": "Google",
-            "industry": "Technology",
-            "size": "Large",
-            "networking_potential": "High",
-            "key_people": ["Software Engineers", "Product Managers", "Data Scientists"],
-            "content_strategy": "Share technical insights, open-source contributions, innovation thoughts"
-        },
-        {
-            "name": "Microsoft",
-            "industry": "Technology", 
-            "size": "Large",
-            "networking_potential": "High",
-            "key_people": ["Cloud Engineers", "AI Researchers", "Developer Advocates"],
-            "content_strategy": "Discuss cloud technologies, AI developments, developer tools"
-        },
-        {
-            "name": "Startup Tech Companies",
-            "industry": "Technology",
-            "size": "Small-Medium",
-            "networking_potential": "Medium",
-            "key_people": ["Founders", "Early Engineers", "Growth Teams"],
-            "content_strategy": "Share startup insights, growth hacking, innovation stories"
+    Served from profiles ingested from LinkedIn data exports (see profile_store.py).
+    """
+    
+    profile = get_profile_store().get(linkedin_url)
+    if profile is None:
+        return {
+            "linkedin_url": linkedin_url,
+            "status": "not_ingested",
+            "message": "No LinkedIn export has been ingested for this profile; use the user profile from the request.",
         }
-    ]
+    return profile
+
+def identify_target_companies(industry: str, role: str, location: str = "Global", size: Optional[str] = None, limit: int = 5) -> List[Dict]:
+    """Identify target companies for networking based on user's profile and goals.
     
-    return target_companies
+    Looks up the local company dataset (COMPANY_DATA_PATH, default data/companies.csv),
+    filtered by industry, location and size (Small, Medium, Large) and ranked by how
+    well the company's key people match the role. Filters that match nothing are
+    relaxed, so some companies are always returned.
+    """
+    
+    return get_company_index().search(industry=industry, role=role, location=location, size=size, limit=limit)
 
-@tool
 def generate_networking_hashtags(target_companies: List[str], industry: str) -> List[str]:
     """Generate hashtags specifically for networking with target company employees."""
     
@@ -96,7 +79,6 @@ def generate_networking_hashtags(target_companies: List[str], industry: str) ->
     
     return list(set(networking_hashtags))[:8]  # Limit to 8 unique hashtags
 
-@tool
 def create_networking_cta(target_companies: List[str], content_type: str) -> str:
     """Create call-to-action specifically designed for networking with target company employees."""
     
@@ -110,165 +92,366 @@ def create_networking_cta(target_companies: List[str], content_type: str) -> str
     
     return cta_templates.get(content_type, cta_templates["general"])
 
+def queue_visual(prompt: str) -> str:
+    """Queue a supporting image for the post. Returns a job handle immediately; the image is generated in the background.
+    
+    Args:
+        prompt: Detailed description of the image or infographic to create.
+    """
+    from visual_queue import current_visual_jobs
+    
+    job = get_visual_queue().submit(prompt)
+    jobs = current_visual_jobs.get()
+    if jobs is not None:
+        jobs.append(job)
+    return json.dumps({"visual_job_id": job.job_id, "status": job.status})
+
+@lru_cache(maxsize=None)
+def load_environment():
+    """Load .env once, on first use rather than at import."""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+@lru_cache(maxsize=None)
+def get_gemini_client() -> "Client":
+    """Return the single google-genai client shared by every model and tool."""
+    from google.genai import Client
+    load_environment()
+    return Client(api_key=os.getenv("GOOGLE_API_KEY"))
+
+def create_gemini_model() -> "Gemini":
+    """Build a Gemini model bound to the shared client and the process-wide request scheduler."""
+    from gemini_scheduler import ScheduledGemini
+    return ScheduledGemini(id=MODEL_ID, api_key=os.getenv("GOOGLE_API_KEY"), client=get_gemini_client())
+
+def create_image_generator():
+    """Return the callable that turns a visual prompt into PNG bytes.
+    
+    Image requests share the Gemini scheduler at batch priority, behind interactive text calls.
+    """
+    from gemini_scheduler import get_scheduler
+    from visual_queue import DEFAULT_IMAGE_MODEL, imagen_generator
+    generate = imagen_generator(get_gemini_client())
+    return lambda prompt: get_scheduler().call(lambda: generate(prompt), DEFAULT_IMAGE_MODEL, priority_name="batch")
+
+@lru_cache(maxsize=None)
+def get_visual_queue() -> "VisualQueue":
+    """Shared background image queue; VISUAL_WORKERS bounds concurrent generations."""
+    from visual_queue import VisualQueue
+    return VisualQueue(create_image_generator(), max_workers=int(os.getenv("VISUAL_WORKERS", "2")))
+
+@lru_cache(maxsize=None)
+def get_research_tools() -> "CachedDuckDuckGoTools":
+    """Shared across every team so repeated research queries hit one cache."""
+    from research_cache import CachedDuckDuckGoTools
+    return CachedDuckDuckGoTools()
+
+@lru_cache(maxsize=None)
+def get_company_index() -> "CompanyIndex":
+    """Company dataset index, built once and reloaded incrementally when the file changes."""
+    from company_index import CompanyIndex
+    return CompanyIndex()
+
+@lru_cache(maxsize=None)
+def get_profile_store() -> "ProfileStore":
+    """Profiles ingested from LinkedIn exports, shared by every run."""
+    from profile_store import ProfileStore
+    return ProfileStore()
+
+@lru_cache(maxsize=None)
+def get_response_cache() -> "ResponseCache":
+    """Shared full-run response cache used by every LinkedInContentCreator."""
+    from response_cache import ResponseCache
+    return ResponseCache()
+
+@lru_cache(maxsize=None)
+def get_metrics_registry() -> "MetricsRegistry":
+    """Shared run metrics; set RUN_METRICS_JSONL to also append each run there as JSON."""
+    from instrumentation import MetricsRegistry
+    return MetricsRegistry(jsonl_path=os.getenv("RUN_METRICS_JSONL"))
+
 # Agent 1: Insight Generator Agent
-insight_generator = Agent(
-    name="Insight Generator",
-    role="Transforms raw inputs into meaningful content insights for networking",
-    model=Gemini(id="gemini-2.0-flash-exp"),
-    tools=[DuckDuckGoTools(), analyze_linkedin_profile, identify_target_companies],
-    description="Expert trend miner and networking strategist who transforms user inputs into engaging content insights that attract target company professionals.",
-    instructions=[
-        "You are a LinkedIn networking and content insight specialist.",
-        "Your goal is to help users create content that attracts professionals from their target companies.",
-        "When analyzing user inputs:",
-        "1. Extract key insights that would interest professionals at target companies",
-        "2. Research current trends relevant to the user's industry and target companies",
-        "3. Identify networking opportunities and conversation starters",
-        "4. Find common interests between user and target company employees",
-        "5. Suggest content angles that showcase expertise while inviting collaboration",
-        "",
-        "Example Analysis Process:",
-        "- User shares: 'Just learned about microservices architecture'",
-        "- Research: Current microservices trends at Google, Microsoft, Netflix",
-        "- Insight: 'Microservices adoption challenges and solutions that resonate with engineers at these companies'",
-        "- Networking angle: 'Share learning journey + ask for experiences from senior engineers'",
-        "",
-        "Always focus on creating genuine value for target company professionals while positioning the user as someone worth connecting with."
-    ],
-    add_datetime_to_instructions=True,
-    show_tool_calls=True
-)
+def create_insight_generator(with_lookups: bool = True) -> "Agent":
+    """Build a fresh Insight Generator agent.
+    
+    Pass with_lookups=False when the profile and target company lookups are
+    done outside the agent; it then keeps only the research tools.
+    """
+    from agno.agent import Agent
+    return Agent(
+        name="Insight Generator",
+        role="Transforms raw inputs into meaningful content insights for networking",
+        model=create_gemini_model(),
+        tools=[get_research_tools(), analyze_linkedin_profile, identify_target_companies] if with_lookups else [get_research_tools()],
+        description="Expert trend miner and networking strategist who transforms user inputs into engaging content insights that attract target company professionals.",
+        instructions=[
+            "You are a LinkedIn networking and content insight specialist.",
+            "Your goal is to help users create content that attracts professionals from their target companies.",
+            "When analyzing user inputs:",
+            "1. Extract key insights that would interest professionals at target companies",
+            "2. Research current trends relevant to the user's industry and target companies",
+            "3. Identify networking opportunities and conversation starters",
+            "4. Find common interests between user and target company employees",
+            "5. Suggest content angles that showcase expertise while inviting collaboration",
+            "",
+            "Example Analysis Process:",
+            "- User shares: 'Just learned about microservices architecture'",
+            "- Research: Current microservices trends at Google, Microsoft, Netflix",
+            "- Insight: 'Microservices adoption challenges and solutions that resonate with engineers at these companies'",
+            "- Networking angle: 'Share learning journey + ask for experiences from senior engineers'",
+            "",
+            "Always focus on creating genuine value for target company professionals while positioning the user as someone worth connecting with."
+        ],
+        add_datetime_to_instructions=True,
+        show_tool_calls=True
+    )
 
 # Agent 2: Content Architect Agent  
-content_architect = Agent(
-    name="Content Architect",
-    role="Designs networking-focused LinkedIn content with personal brand consistency",
-    model=Gemini(id="gemini-2.0-flash-exp"),
-    tools=[generate_networking_hashtags, create_networking_cta],
-    description="LinkedIn content architect specializing in networking-focused posts that attract target company professionals while maintaining authentic personal brand.",
-    instructions=[
-        "You are a LinkedIn content architect focused on professional networking and relationship building.",
-        "Your mission is to create content that naturally attracts professionals from target companies.",
-        "",
-        "Content Structure Guidelines:",
-        "1. HOOK (First 2 lines): Grab attention of target company professionals",
-        "2. STORY/INSIGHT: Share valuable experience or learning",
-        "3. VALUE: Provide actionable insights or thought-provoking questions", 
-        "4. NETWORKING CTA: Invite connection and conversation",
-        "5. HASHTAGS: Strategic mix of industry + company-specific tags",
-        "",
-        "Example Post Structure:",
-        "🚀 Just implemented a solution that reduced API response time by 60%",
-        "(Hook targeting engineers)",
-        "",
-        "Here's what I learned about database optimization...",
-        "(Story with technical value)",
-        "",
-        "The key insight: [specific technical detail]",
-        "(Actionable value for peers)",
-        "",
-        "Fellow engineers at Google, Microsoft - what's your approach to this challenge?",
-        "(Networking CTA)",
-        "",
-        "#SoftwareEngineering #Google #Microsoft #DatabaseOptimization",
-        "(Strategic hashtags)",
-        "",
-        "Tone Guidelines:",
-        "- Professional but approachable",
-        "- Confident but humble",
-        "- Knowledgeable but curious",
-        "- Authentic and genuine",
-        "- Focused on mutual value creation"
-    ],
-    show_tool_calls=True
-)
+def create_content_architect(with_tools: bool = True) -> "Agent":
+    """Build a fresh Content Architect agent.
+    
+    Pass with_tools=False when hashtags and CTA are precomputed and handed
+    to the agent in its prompt.
+    """
+    from agno.agent import Agent
+    return Agent(
+        name="Content Architect",
+        role="Designs networking-focused LinkedIn content with personal brand consistency",
+        model=create_gemini_model(),
+        tools=[generate_networking_hashtags, create_networking_cta] if with_tools else [],
+        description="LinkedIn content architect specializing in networking-focused posts that attract target company professionals while maintaining authentic personal brand.",
+        instructions=[
+            "You are a LinkedIn content architect focused on professional networking and relationship building.",
+            "Your mission is to create content that naturally attracts professionals from target companies.",
+            "",
+            "Content Structure Guidelines:",
+            "1. HOOK (First 2 lines): Grab attention of target company professionals",
+            "2. STORY/INSIGHT: Share valuable experience or learning",
+            "3. VALUE: Provide actionable insights or thought-provoking questions", 
+            "4. NETWORKING CTA: Invite connection and conversation",
+            "5. HASHTAGS: Strategic mix of industry + company-specific tags",
+            "",
+            "Example Post Structure:",
+            "🚀 Just implemented a solution that reduced API response time by 60%",
+            "(Hook targeting engineers)",
+            "",
+            "Here's what I learned about database optimization...",
+            "(Story with technical value)",
+            "",
+            "The key insight: [specific technical detail]",
+            "(Actionable value for peers)",
+            "",
+            "Fellow engineers at Google, Microsoft - what's your approach to this challenge?",
+            "(Networking CTA)",
+            "",
+            "#SoftwareEngineering #Google #Microsoft #DatabaseOptimization",
+            "(Strategic hashtags)",
+            "",
+            "Tone Guidelines:",
+            "- Professional but approachable",
+            "- Confident but humble",
+            "- Knowledgeable but curious",
+            "- Authentic and genuine",
+            "- Focused on mutual value creation"
+        ],
+        show_tool_calls=True
+    )
 
 # Agent 3: Post Publisher & Visualizer Agent
-post_publisher = Agent(
-    name="Post Publisher & Visualizer",
-    role="Creates visuals and optimizes posts for maximum networking impact",
-    # --- CHANGED: Pass GOOGLE_API_KEY from environment ---
-    model=Gemini(id="gemini-2.0-flash-exp", api_key=os.getenv("GOOGLE_API_KEY")),
-    tools=[GeminiTools(api_key=os.getenv("GOOGLE_API_KEY"))],
-    # --- END CHANGED ---
-    description="Visual content creator and LinkedIn optimization specialist focused on maximizing networking potential and engagement with target company professionals.",
-    instructions=[
-        "You are a LinkedIn visual content creator and networking optimization specialist.",
-        "Your goal is to create visuals and optimize posts for maximum networking impact.",
-        "",
-        "Visual Content Guidelines:",
-        "1. Create professional, clean visuals that appeal to corporate professionals",
-        "2. Use company brand colors when relevant (Google colors for Google-focused content)",
-        "3. Include key statistics, quotes, or insights in visual format",
-        "4. Design carousel posts for complex topics (step-by-step guides, comparisons)",
-        "5. Create infographics that professionals would want to share with their teams",
-        "",
-        "Optimization Strategies:",
-        "1. Post timing: Optimize for when target company employees are most active",
-        "2. Engagement hooks: Questions that encourage comments from target professionals",
-        "3. Shareability: Content that target company employees would share internally",
-        "4. Discussion starters: Topics that naturally lead to professional conversations",
-        "",
-        "Example Visual Ideas:",
-        "- 'Before/After' performance improvements",
-        "- 'Lessons Learned' infographics",
-        "- 'Tech Stack Comparison' charts",
-        "- 'Career Journey' timeline visuals",
-        "- 'Industry Insights' data visualizations",
-        "",
-        "Always ensure visuals are:",
-        "- Professional and corporate-friendly",
-        "- Easy to read on mobile devices",
-        "- Branded consistently with user's personal brand",
-        "- Optimized for LinkedIn's image dimensions"
-    ],
-    show_tool_calls=True
-)
+def create_post_publisher() -> "Agent":
+    """Build a fresh Post Publisher & Visualizer agent."""
+    from agno.agent import Agent
+    return Agent(
+        name="Post Publisher & Visualizer",
+        role="Creates visuals and optimizes posts for maximum networking impact",
+        model=create_gemini_model(),
+        tools=[queue_visual],
+        description="Visual content creator and LinkedIn optimization specialist focused on maximizing networking potential and engagement with target company professionals.",
+        instructions=[
+            "You are a LinkedIn visual content creator and networking optimization specialist.",
+            "Your goal is to create visuals and optimize posts for maximum networking impact.",
+            "",
+            "Visual Content Guidelines:",
+            "1. Create professional, clean visuals that appeal to corporate professionals",
+            "2. Use company brand colors when relevant (Google colors for Google-focused content)",
+            "3. Include key statistics, quotes, or insights in visual format",
+            "4. Design carousel posts for complex topics (step-by-step guides, comparisons)",
+            "5. Create infographics that professionals would want to share with their teams",
+            "6. Request visuals with queue_visual; it returns a visual_job_id right away, so include that id in your output instead of waiting for the image",
+            "",
+            "Optimization Strategies:",
+            "1. Post timing: Optimize for when target company employees are most active",
+            "2. Engagement hooks: Questions that encourage comments from target professionals",
+            "3. Shareability: Content that target company employees would share internally",
+            "4. Discussion starters: Topics that naturally lead to professional conversations",
+            "",
+            "Example Visual Ideas:",
+            "- 'Before/After' performance improvements",
+            "- 'Lessons Learned' infographics",
+            "- 'Tech Stack Comparison' charts",
+            "- 'Career Journey' timeline visuals",
+            "- 'Industry Insights' data visualizations",
+            "",
+            "Always ensure visuals are:",
+            "- Professional and corporate-friendly",
+            "- Easy to read on mobile devices",
+            "- Branded consistently with user's personal brand",
+            "- Optimized for LinkedIn's image dimensions"
+        ],
+        show_tool_calls=True
+    )
 
 # LinkedIn Content Creator Team
-linkedin_content_team = Team(
-    name="LinkedIn Networking Content Team",
-    mode="coordinate", 
-    model=Gemini(id="gemini-2.0-flash-exp"),
-    members=[insight_generator, content_architect, post_publisher],
-    description="Specialized team creating LinkedIn content designed to attract and network with professionals from target companies.",
-    instructions=[
-        "You are coordinating a team of LinkedIn networking specialists.",
-        "Your mission: Transform user inputs into compelling content that attracts target company professionals.",
-        "",
-        "Workflow Process:",
-        "1. INSIGHT GENERATOR: Analyze user input + research target companies + identify networking opportunities",
-        "2. CONTENT ARCHITECT: Structure content for networking impact + create engaging copy + add strategic CTAs",
-        "3. POST PUBLISHER: Create supporting visuals + optimize for engagement + provide posting strategy",
-        "",
-        "Success Criteria:",
-        "- Content showcases user's expertise authentically",
-        "- Naturally attracts target company professionals",
-        "- Encourages meaningful professional conversations",
-        "- Builds user's reputation as a valuable connection",
-        "- Increases networking opportunities with target companies",
-        "",
-        "Always ensure the final content is:",
-        "✅ Professional and corporate-appropriate",
-        "✅ Valuable to target company employees", 
-        "✅ Authentic to user's voice and experience",
-        "✅ Optimized for LinkedIn's algorithm",
-        "✅ Designed to generate meaningful connections"
-    ],
-    add_datetime_to_instructions=True,
-    enable_agentic_context=True,
-    share_member_interactions=True,
-    show_members_responses=True,
-    markdown=True,
-    success_criteria="Create networking-focused LinkedIn content that attracts target company professionals, showcases user expertise, and generates meaningful professional connections and opportunities."
-)
+def create_linkedin_content_team() -> "Team":
+    """Build a fresh team with its own member agents.
+
+    Agno agents and teams keep per-run state on the instance, so every
+    concurrent run needs its own team.
+    """
+    from context_budget import BudgetedTeam
+    return BudgetedTeam(
+        name="LinkedIn Networking Content Team",
+        mode="coordinate", 
+        model=create_gemini_model(),
+        members=[create_insight_generator(), create_content_architect(), create_post_publisher()],
+        description="Specialized team creating LinkedIn content designed to attract and network with professionals from target companies.",
+        instructions=[
+            "You are coordinating a team of LinkedIn networking specialists.",
+            "Your mission: Transform user inputs into compelling content that attracts target company professionals.",
+            "",
+            "Workflow Process:",
+            "1. INSIGHT GENERATOR: Analyze user input + research target companies + identify networking opportunities",
+            "2. CONTENT ARCHITECT: Structure content for networking impact + create engaging copy + add strategic CTAs",
+            "3. POST PUBLISHER: Create supporting visuals + optimize for engagement + provide posting strategy",
+            "",
+            "Success Criteria:",
+            "- Content showcases user's expertise authentically",
+            "- Naturally attracts target company professionals",
+            "- Encourages meaningful professional conversations",
+            "- Builds user's reputation as a valuable connection",
+            "- Increases networking opportunities with target companies",
+            "",
+            "Always ensure the final content is:",
+            "✅ Professional and corporate-appropriate",
+            "✅ Valuable to target company employees", 
+            "✅ Authentic to user's voice and experience",
+            "✅ Optimized for LinkedIn's algorithm",
+            "✅ Designed to generate meaningful connections"
+        ],
+        add_datetime_to_instructions=True,
+        enable_agentic_context=True,
+        share_member_interactions=True,
+        show_members_responses=True,
+        stream_member_events=True,
+        markdown=True,
+        success_criteria="Create networking-focused LinkedIn content that attracts target company professionals, showcases user expertise, and generates meaningful professional connections and opportunities."
+    )
+
+@lru_cache(maxsize=None)
+def build_team() -> "Team":
+    """Return the shared team, building it on first call."""
+    return create_linkedin_content_team()
+
+_LAZY_MEMBERS = {"insight_generator": 0, "content_architect": 1, "post_publisher": 2}
+
+def __getattr__(name: str):
+    # Keep `team.linkedin_content_team` and the agent names importable without eager construction
+    if name == "linkedin_content_team":
+        return build_team()
+    if name in _LAZY_MEMBERS:
+        return build_team().members[_LAZY_MEMBERS[name]]
+    if name == "research_tools":
+        return get_research_tools()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Streaming helpers
+def _stream_chunk(event) -> Optional[Dict]:
+    """Translate an agno team/member stream event into a chunk, or None to skip it."""
+    member = getattr(event, "agent_name", None)
+    if event.event == "TeamRunResponseContent":
+        return {"type": "content", "text": event.content} if event.content else None
+    if member and event.event == "RunResponseContent":
+        return {"type": "member_content", "member": member, "text": event.content} if event.content else None
+    if event.event in ("ToolCallStarted", "TeamToolCallStarted") and event.tool is not None:
+        return {"type": "tool_call", "member": member or getattr(event, "team_name", ""), "tool": event.tool.tool_name}
+    return None
+
+class _StreamLatency:
+    """Time-to-first-token and total latency for one streamed run."""
+    
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.first_token = None
+        self.first_event = None
+    
+    def observe(self, chunk: Dict):
+        now = time.perf_counter()
+        if self.first_event is None:
+            self.first_event = now
+        if self.first_token is None and chunk["type"] == "content":
+            self.first_token = now
+    
+    def finish(self) -> Dict:
+        end = time.perf_counter()
+        return {
+            "time_to_first_event_seconds": round(self.first_event - self.start, 3) if self.first_event else None,
+            "time_to_first_token_seconds": round(self.first_token - self.start, 3) if self.first_token else None,
+            "total_seconds": round(end - self.start, 3),
+        }
+
+def print_run_metrics(creator: "LinkedInContentCreator"):
+    """Print the latency/token summary table for the creator's last run."""
+    from instrumentation import format_summary_table
+    if creator.last_run_metrics is not None:
+        print("\n📊 RUN METRICS")
+        print(format_summary_table(creator.last_run_metrics))
+
+def print_stream(chunks: Iterator[Dict]):
+    """Render streamed chunks to the terminal as they arrive."""
+    at_line_start = True
+    for chunk in chunks:
+        if chunk["type"] == "content":
+            print(chunk["text"], end="", flush=True)
+            at_line_start = chunk["text"].endswith("\n")
+            continue
+        if not at_line_start:
+            print()
+            at_line_start = True
+        if chunk["type"] == "tool_call":
+            print(f"  🔧 [{chunk['member']}] {chunk['tool']}", flush=True)
+        elif chunk["type"] == "member_content":
+            print(f"  💬 [{chunk['member']}] {chunk['text'].strip()[:100]}", flush=True)
+        elif chunk["type"] == "metrics":
+            print(f"\n⏱️ First token after {chunk['time_to_first_token_seconds']}s, total {chunk['total_seconds']}s")
+
+def print_visual_jobs(creator: "LinkedInContentCreator"):
+    """Wait for the visuals queued by the creator's last run and print where they were stored."""
+    for job in creator.last_visual_jobs:
+        print(f"\n🖼️ Visual {job.job_id}: {job.status}", flush=True)
+        try:
+            print(f"   saved to {job.result()}")
+        except Exception as e:
+            print(f"   failed: {e}")
 
 # Dynamic User Input Handler
 class LinkedInContentCreator:
-    def __init__(self):
-        self.team = linkedin_content_team
+    def __init__(
+        self,
+        team: Optional["Team"] = None,
+        use_cache: bool = True,
+        cache: Optional["ResponseCache"] = None,
+        context_budget_tokens: Optional[int] = DEFAULT_CONTEXT_BUDGET_TOKENS,
+    ):
+        self.team = team or build_team()
+        self.use_cache = use_cache
+        self.cache = cache
+        self.context_budget_tokens = context_budget_tokens
+        self.last_context_report: Optional[Dict] = None
+        self.last_visual_jobs: List["VisualJob"] = []
         self.user_profile = {}
         self.target_companies = []
+        self.last_stream_metrics: Dict = {}
+        self.last_run_metrics = None
     
     def get_user_input(self):
         """Collect dynamic user input for content creation."""
@@ -306,14 +489,15 @@ class LinkedInContentCreator:
             "networking_goal": networking_goal
         }
     
-    def create_networking_content(self, user_input: Dict):
-        """Create LinkedIn content optimized for networking with target companies."""
+    def build_prompt(self, user_input: Dict) -> str:
+        """Render the team prompt for a single user input."""
         
-        prompt = f"""
+        return f"""
         Create a LinkedIn post optimized for networking with target company professionals:
         
         USER PROFILE:
         - Name: {user_input['user_profile']['name']}
+        - LinkedIn: {user_input['user_profile'].get('linkedin_url') or 'not provided'}
         - Role: {user_input['user_profile']['current_role']}
         - Company: {user_input['user_profile']['company']}
         - Industry: {user_input['user_profile']['industry']}
@@ -335,44 +519,247 @@ class LinkedInContentCreator:
         
         The content should feel authentic and valuable, not salesy or desperate for connections.
         """
+    
+    def create_networking_content(self, user_input: Dict, use_cache: Optional[bool] = None):
+        """Create LinkedIn content optimized for networking with target companies.
+        
+        Repeat submissions are served from the response cache unless caching
+        is disabled on the creator or with use_cache=False.
+        """
+        
+        cache, key = self._cache_lookup_key(user_input, use_cache)
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                self.last_run_metrics = None
+                self.last_visual_jobs = []
+                return cached
+        
+        # stream=False explicitly: a previous streamed run leaves team.stream set
+        started = time.perf_counter()
+        with self._run_context() as budget:
+            response = self.team.run(self.build_prompt(user_input), stream=False)
+        self._record_run(response, started, budget)
+        if cache is not None and response.content:
+            cache.set(key, response)
+        return response
+    
+    async def acreate_networking_content(self, user_input: Dict, use_cache: Optional[bool] = None):
+        """Async variant of create_networking_content using the team's async path."""
         
-        return self.team.run(prompt)
+        # The cache is SQLite and writes on every lookup, so keep it off the event loop
+        cache, key = await asyncio.to_thread(self._cache_lookup_key, user_input, use_cache)
+        if cache is not None:
+            cached = await asyncio.to_thread(cache.get, key)
+            if cached is not None:
+                self.last_run_metrics = None
+                self.last_visual_jobs = []
+                return cached
+        
+        started = time.perf_counter()
+        with self._run_context() as budget:
+            response = await self.team.arun(self.build_prompt(user_input), stream=False)
+        self._record_run(response, started, budget)
+        if cache is not None and response.content:
+            await asyncio.to_thread(cache.set, key, response)
+        return response
+    
+    def _new_context_budget(self) -> Optional["ContextBudget"]:
+        if not self.context_budget_tokens:
+            return None
+        from context_budget import ContextBudget
+        return ContextBudget(max_tokens=self.context_budget_tokens)
+    
+    @contextmanager
+    def _run_context(self):
+        """Bind a fresh context budget and visual job list to one run; yields the budget."""
+        from visual_queue import collect_visual_jobs
+        budget = self._new_context_budget()
+        with budget.activate() if budget is not None else nullcontext(), collect_visual_jobs() as jobs:
+            yield budget
+        self.last_visual_jobs = jobs
+    
+    def _record_run(self, response, started: float, budget: Optional["ContextBudget"] = None):
+        """Collect per-agent/per-tool metrics for a finished run into last_run_metrics and the registry."""
+        from instrumentation import collect_run_metrics
+        self.last_context_report = budget.report() if budget is not None else None
+        if response is None:
+            return
+        self.last_run_metrics = collect_run_metrics(response, time.perf_counter() - started)
+        if self.last_context_report is not None:
+            self.last_run_metrics.context_tokens_saved = self.last_context_report["saved_tokens"]
+        get_metrics_registry().record(self.last_run_metrics)
+    
+    def _cache_lookup_key(self, user_input: Dict, use_cache: Optional[bool]):
+        """Return (cache, key) for this run, or (None, None) when caching is off."""
+        if not (self.use_cache if use_cache is None else use_cache):
+            return None, None
+        cache = self.cache if self.cache is not None else get_response_cache()
+        model_ids = [self.team.model.id] + [member.model.id for member in self.team.members]
+        return cache, cache.key(user_input, model_ids)
+    
+    def stream_networking_content(self, user_input: Dict) -> Iterator[Dict]:
+        """Stream a run as chunks: post text as it is generated plus member events.
+        
+        Yields dicts with a "type" of "content" (a piece of the final post),
+        "member_content", "tool_call" or "metrics". The last chunk is always
+        "metrics" with time-to-first-token and total latency, which is also
+        kept on self.last_stream_metrics.
+        """
+        tracker = _StreamLatency()
+        with self._run_context() as budget:
+            events = self.team.run(self.build_prompt(user_input), stream=True, stream_intermediate_steps=True)
+            for event in events:
+                chunk = _stream_chunk(event)
+                if chunk is not None:
+                    tracker.observe(chunk)
+                    yield chunk
+        self.last_stream_metrics = tracker.finish()
+        self._record_run(getattr(self.team, "run_response", None), tracker.start, budget)
+        yield {"type": "metrics", **self.last_stream_metrics}
+    
+    async def astream_networking_content(self, user_input: Dict) -> AsyncIterator[Dict]:
+        """Async variant of stream_networking_content."""
+        tracker = _StreamLatency()
+        with self._run_context() as budget:
+            events = await self.team.arun(self.build_prompt(user_input), stream=True, stream_intermediate_steps=True)
+            async for event in events:
+                chunk = _stream_chunk(event)
+                if chunk is not None:
+                    tracker.observe(chunk)
+                    yield chunk
+        self.last_stream_metrics = tracker.finish()
+        self._record_run(getattr(self.team, "run_response", None), tracker.start, budget)
+        yield {"type": "metrics", **self.last_stream_metrics}
+    
+    def run_batch(self, input_path: str, output_path: str, concurrency: int = 4) -> Dict:
+        """Generate posts for every user input in a JSONL file. See arun_batch."""
+        
+        return asyncio.run(self.arun_batch(input_path, output_path, concurrency))
+    
+    async def arun_batch(self, input_path: str, output_path: str, concurrency: int = 4) -> Dict:
+        """Generate posts for a JSONL file of user inputs, `concurrency` at a time.
+        
+        Each input line has the same shape as the dicts passed to
+        create_networking_content. One JSON record is appended to
+        `output_path` as soon as each post finishes, so results are streamed
+        rather than held in memory. A failing line is recorded with
+        status "error" and does not stop the rest of the batch.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        
+        # Each worker owns its own team because agno runs are not re-entrant
+        creators = [self] + [
+            LinkedInContentCreator(team=create_linkedin_content_team(), use_cache=self.use_cache, cache=self.cache)
+            for _ in range(concurrency - 1)
+        ]
+        queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+        stats = {"total": 0, "succeeded": 0, "failed": 0}
+        batch_start = time.perf_counter()
+        
+        with open(output_path, "w", encoding="utf-8") as output_file:
+            
+            async def worker(creator: "LinkedInContentCreator"):
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        return
+                    line_number, line = item
+                    record = {"line": line_number}
+                    item_start = time.perf_counter()
+                    try:
+                        user_input = json.loads(line)
+                        if "id" in user_input:
+                            record["id"] = user_input["id"]
+                        response = await creator.acreate_networking_content(user_input)
+                        record["status"] = "ok"
+                        record["content"] = response.content
+                        if creator.last_visual_jobs:
+                            record["visual_jobs"] = [job.job_id for job in creator.last_visual_jobs]
+                        stats["succeeded"] += 1
+                    except Exception as e:
+                        record["status"] = "error"
+                        record["error"] = f"{type(e).__name__}: {e}"
+                        stats["failed"] += 1
+                    record["elapsed_seconds"] = round(time.perf_counter() - item_start, 3)
+                    output_file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                    output_file.flush()
+                    done = stats["succeeded"] + stats["failed"]
+                    print(f"📦 [{done}/{stats['total']}] line {line_number}: {record['status']} ({record['elapsed_seconds']}s)")
+            
+            from gemini_scheduler import priority
+            # Tasks copy the context at creation, so every model call they make is scheduled as batch work
+            with priority("batch"):
+                workers = [asyncio.create_task(worker(creator)) for creator in creators]
+            with open(input_path, encoding="utf-8") as input_file:
+                for line_number, line in enumerate(input_file, start=1):
+                    if not line.strip():
+                        continue
+                    stats["total"] += 1
+                    await queue.put((line_number, line))
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        
+        stats["elapsed_seconds"] = round(time.perf_counter() - batch_start, 3)
+        if self.use_cache:
+            stats["cache"] = (self.cache if self.cache is not None else get_response_cache()).stats()
+        return stats
 
 # Example Usage and Demonstrations
+# Example 1: Learning Post for Google/Microsoft targeting
+EXAMPLE_USER_INPUT = {
+    "user_profile": {
+        "name": "Alex Chen",
+        "current_role": "Senior Software Engineer", 
+        "company": "TechStartup Inc",
+        "industry": "Technology",
+        "experience_years": "6"
+    },
+    "target_companies": ["Google", "Microsoft", "Meta"],
+    "content_type": "learning",
+    "content_details": "Just completed advanced Kubernetes certification and implemented a microservices architecture that improved our system scalability by 300%",
+    "networking_goal": "Connect with senior engineers and architects at FAANG companies to discuss best practices and potential opportunities"
+}
+
 def run_examples():
     """Run example scenarios to demonstrate the system."""
     
     print("🎯 LinkedIn Networking Content Creator - Examples")
     print("=" * 60)
     
-    # Example 1: Learning Post for Google/Microsoft targeting
-    example1 = {
-        "user_profile": {
-            "name": "Alex Chen",
-            "current_role": "Senior Software Engineer", 
-            "company": "TechStartup Inc",
-            "industry": "Technology",
-            "experience_years": "6"
-        },
-        "target_companies": ["Google", "Microsoft", "Meta"],
-        "content_type": "learning",
-        "content_details": "Just completed advanced Kubernetes certification and implemented a microservices architecture that improved our system scalability by 300%",
-        "networking_goal": "Connect with senior engineers and architects at FAANG companies to discuss best practices and potential opportunities"
-    }
-    
     print("\n📚 EXAMPLE 1: Learning Achievement Post")
     print("-" * 40)
     creator = LinkedInContentCreator()
-    result1 = creator.create_networking_content(example1)
+    result1 = creator.create_networking_content(EXAMPLE_USER_INPUT)
     print(result1)
+    print_run_metrics(creator)
+    print_visual_jobs(creator)
 
     # Add this at the end of your file to run the examples
 if __name__ == "__main__":
     # You can either run examples or use the interactive mode
-    choice = input("Run examples (e) or interactive mode (i)? ").lower()
+    choice = input("Run examples (e), interactive mode (i), streaming interactive mode (s) or batch mode (b)? ").lower()
     
     if choice == 'e':
         run_examples()
+    elif choice == 's':
+        creator = LinkedInContentCreator()
+        user_input = creator.get_user_input()
+        print("\n" + "="*60)
+        print("🎯 GENERATED LINKEDIN CONTENT")
+        print("="*60)
+        print_stream(creator.stream_networking_content(user_input))
+        print_run_metrics(creator)
+        print_visual_jobs(creator)
+    elif choice == 'b':
+        input_path = input("📥 Input JSONL file: ")
+        output_path = input("📤 Output JSONL file: ")
+        concurrency = int(input("⚡ Concurrency (default 4): ") or 4)
+        stats = LinkedInContentCreator().run_batch(input_path, output_path, concurrency)
+        print("\n" + "="*60)
+        print(f"✅ Batch finished: {stats['succeeded']} succeeded, {stats['failed']} failed in {stats['elapsed_seconds']}s")
     else:
         creator = LinkedInContentCreator()
         user_input = creator.get_user_input()
@@ -380,4 +767,6 @@ if __name__ == "__main__":
         print("\n" + "="*60)
         print("🎯 GENERATED LINKEDIN CONTENT")
         print("="*60)
-        print(result)
\ No newline at end of file
+        print(result)
+        print_run_metrics(creator)
+        print_visual_jobs(creator)
\ No newline at end of file
@@ -0,0 +1,58 @@
+"""ResponseCache keys: only what the team prompt renders may tell two inputs apart."""
+import copy
+
+from response_cache import ResponseCache
+from sqlite_store import SQLiteStore
+
+USER_INPUT = {
+    "user_profile": {
+        "name": "Alex Chen",
+        "current_role": "Senior Software Engineer",
+        "company": "TechStartup Inc",
+        "industry": "Technology",
+        "experience_years": 5,
+    },
+    "target_companies": ["Google", "Microsoft"],
+    "content_type": "learning",
+    "content_details": "Finished a Kubernetes certification",
+    "networking_goal": "Connect with platform engineers",
+}
+MODELS = ["gemini-2.0-flash"]
+
+
+def make_cache() -> ResponseCache:
+    return ResponseCache(store=SQLiteStore(":memory:"))
+
+
+def test_batch_id_and_unused_keys_share_a_key():
+    cache = make_cache()
+    resubmitted = dict(copy.deepcopy(USER_INPUT), id=17, source="batch-2")
+    resubmitted["user_profile"]["headline"] = "Builder of platforms"
+    assert cache.key(resubmitted, MODELS) == cache.key(USER_INPUT, MODELS)
+
+
+def test_id_difference_still_hits():
+    from agno.run.team import TeamRunResponse
+
+    cache = make_cache()
+    cache.set(cache.key(dict(USER_INPUT, id=1), MODELS), TeamRunResponse(content="cached post", run_id="run-1"))
+    hit = cache.get(cache.key(dict(USER_INPUT, id=2), MODELS))
+    assert hit is not None and hit.content == "cached post"
+    assert cache.stats()["hits"] == 1
+
+
+def test_rendered_fields_change_the_key():
+    cache = make_cache()
+    base = cache.key(USER_INPUT, MODELS)
+    with_url = copy.deepcopy(USER_INPUT)
+    with_url["user_profile"]["linkedin_url"] = "https://linkedin.com/in/alexchen"
+    assert cache.key(with_url, MODELS) != base
+    assert cache.key(dict(USER_INPUT, content_type="question"), MODELS) != base
+    assert cache.key(USER_INPUT, ["gemini-2.5-pro"]) != base
+
+
+def test_empty_linkedin_url_matches_missing():
+    cache = make_cache()
+    empty_url = copy.deepcopy(USER_INPUT)
+    empty_url["user_profile"]["linkedin_url"] = ""
+    assert cache.key(empty_url, MODELS) == cache.key(USER_INPUT, MODELS)
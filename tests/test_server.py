@@ -0,0 +1,163 @@
+"""ContentService/ContentServer against the offline stubs: queueing, 429, cancellation, streaming and validation."""
+import asyncio
+import json
+import os
+
+import pytest
+
+from benchmarks.stubs import install_stubs
+
+
+PROFILE = {"name": "Alex", "current_role": "Engineer", "company": "Acme", "industry": "Technology", "experience_years": 5}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def offline():
+    os.environ["RESPONSE_CACHE_PATH"] = ":memory:"
+    install_stubs(latency_seconds=0.1, search_latency_seconds=0.01, image_latency_seconds=0.01)
+    import team
+    team.get_response_cache.cache_clear()
+
+
+def user_input(tag: str) -> dict:
+    import team
+    return dict(team.EXAMPLE_USER_INPUT, content_details=f"{team.EXAMPLE_USER_INPUT['content_details']} ({tag})")
+
+
+async def start(concurrency: int = 1, queue_size: int = 1):
+    from server import ContentServer, ContentService
+
+    service = ContentService(concurrency, queue_size)
+    await service.start()
+    server = await asyncio.start_server(ContentServer(service).handle, "127.0.0.1", 0)
+    return service, server, server.sockets[0].getsockname()[1]
+
+
+async def stop(service, server):
+    server.close()
+    await server.wait_closed()
+    await service.stop()
+
+
+async def open_request(port: int, path: str, body: bytes, headers: str = ""):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    if "Content-Length" not in headers:
+        headers += f"Content-Length: {len(body)}\r\n"
+    writer.write(f"POST {path} HTTP/1.1\r\nHost: test\r\n{headers}\r\n".encode() + body)
+    await writer.drain()
+    return reader, writer
+
+
+async def request(port: int, path: str, body: bytes, headers: str = ""):
+    reader, writer = await open_request(port, path, body, headers)
+    response = await asyncio.wait_for(reader.read(), 30)
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), head.decode("latin-1"), payload
+
+
+def dechunk(payload: bytes) -> bytes:
+    data = b""
+    while True:
+        size_line, _, payload = payload.partition(b"\r\n")
+        size = int(size_line, 16)
+        if size == 0:
+            return data
+        data, payload = data + payload[:size], payload[size + 2:]
+
+
+async def wait_for(condition, timeout: float = 10.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+        await asyncio.sleep(0.02)
+
+
+def test_queue_full_returns_429():
+    async def scenario():
+        service, server, port = await start(concurrency=1, queue_size=1)
+        try:
+            running = asyncio.ensure_future(request(port, "/generate", json.dumps(user_input("running")).encode()))
+            await wait_for(lambda: service.in_flight == 1)
+            queued = asyncio.ensure_future(request(port, "/generate", json.dumps(user_input("queued")).encode()))
+            await wait_for(lambda: service.queue.qsize() == 1)
+
+            status, head, _ = await request(port, "/generate", json.dumps(user_input("rejected")).encode())
+            assert status == 429
+            assert "Retry-After: 1" in head
+            assert service.counters["rejected"] == 1
+
+            for status, _, payload in await asyncio.gather(running, queued):
+                assert status == 200
+                assert json.loads(payload)["content"]
+            assert service.counters["completed"] == 2
+        finally:
+            await stop(service, server)
+
+    asyncio.run(scenario())
+
+
+def test_disconnect_cancels_run_and_rebuilds_worker():
+    async def scenario():
+        service, server, port = await start(concurrency=1, queue_size=1)
+        try:
+            original_creator = service.creators[0]
+            _, writer = await open_request(port, "/generate", json.dumps(user_input("abandoned")).encode())
+            await wait_for(lambda: service.in_flight == 1)
+            writer.close()
+
+            await wait_for(lambda: service.counters["cancelled"] == 1 and service.in_flight == 0)
+            await wait_for(lambda: service.creators[0] is not original_creator)
+            assert service.counters["completed"] == 0
+
+            status, _, payload = await request(port, "/generate", json.dumps(user_input("after")).encode())
+            assert status == 200
+            assert json.loads(payload)["content"]
+        finally:
+            await stop(service, server)
+
+    asyncio.run(scenario())
+
+
+def test_streaming_returns_ndjson_chunks():
+    async def scenario():
+        service, server, port = await start()
+        try:
+            status, head, payload = await request(port, "/generate?stream=1", json.dumps(user_input("stream")).encode())
+            assert status == 200
+            assert "application/x-ndjson" in head
+            lines = [json.loads(line) for line in dechunk(payload).decode("utf-8").splitlines()]
+            assert lines
+            assert all(isinstance(line, dict) for line in lines)
+            assert not any(line.get("type") == "error" for line in lines)
+            assert service.counters["completed"] == 1
+        finally:
+            await stop(service, server)
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("body, headers", [
+    (b"not json", ""),
+    (b"123", ""),
+    (json.dumps("user_profile target_companies content_type content_details networking_goal").encode(), ""),
+    (json.dumps({"user_profile": {}, "target_companies": ["Google"], "content_type": "learning",
+                 "content_details": "x", "networking_goal": "y"}).encode(), ""),
+    (json.dumps({"target_companies": ["Google"]}).encode(), ""),
+    (json.dumps({"user_profile": PROFILE, "target_companies": "Google", "content_type": "learning",
+                 "content_details": "x", "networking_goal": "y"}).encode(), ""),
+    (b"{}", "Content-Length: abc\r\n"),
+    (b"{}", "Content-Length: -5\r\n"),
+])
+def test_bad_request_returns_400(body, headers):
+    async def scenario():
+        service, server, port = await start()
+        try:
+            status, _, payload = await request(port, "/generate", body, headers)
+            assert status == 400
+            assert json.loads(payload)["error"]
+            assert service.counters["accepted"] == 0
+        finally:
+            await stop(service, server)
+
+    asyncio.run(scenario())
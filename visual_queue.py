@@ -0,0 +1,243 @@
+"""Background image generation for the Post Publisher.
+
+Generating an infographic takes far longer than writing the post, so the
+publisher no longer calls GeminiTools.generate_image inline. Its queue_visual
+tool hands the prompt to a VisualQueue and gets a job handle back at once;
+a bounded thread pool generates the image and writes it to an ImageStore
+addressed by content hash. The job id is derived from the normalized prompt,
+so a prompt that is already stored or already being generated reuses that
+image instead of paying for it again, and a handle stays valid across
+processes as long as the store is kept.
+"""
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+import asyncio
+import hashlib
+import os
+import tempfile
+import threading
+
+if TYPE_CHECKING:
+    from google.genai import Client
+
+DEFAULT_IMAGE_STORE_PATH = os.path.join(".cache", "images")
+DEFAULT_IMAGE_MODEL = "imagen-3.0-generate-002"
+MAX_FAILED_JOBS = 256
+
+# Jobs queued during the current run, collected for LinkedInContentCreator.last_visual_jobs
+current_visual_jobs: ContextVar[Optional[List["VisualJob"]]] = ContextVar("current_visual_jobs", default=None)
+
+
+def normalize_visual_prompt(prompt: str) -> str:
+    """Case-fold and collapse whitespace so trivially different prompts share an image."""
+    return " ".join(prompt.split()).casefold()
+
+
+def visual_job_id(prompt: str, model: str) -> str:
+    payload = f"{model}\n{normalize_visual_prompt(prompt)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+class ImageStore:
+    """Content-addressed image files plus an index from visual job id to image.
+
+    Images live at <root>/<sha256 of bytes>.png, so identical images are stored
+    once; <root>/jobs/<job id> holds the digest of the image for that prompt.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.getenv("IMAGE_STORE_PATH", DEFAULT_IMAGE_STORE_PATH)
+        os.makedirs(os.path.join(self.root, "jobs"), exist_ok=True)
+
+    def lookup(self, job_id: str) -> Optional[str]:
+        """Return the image path stored for job_id, or None."""
+        try:
+            with open(os.path.join(self.root, "jobs", job_id), encoding="utf-8") as index_file:
+                digest = index_file.read().strip()
+        except FileNotFoundError:
+            return None
+        path = os.path.join(self.root, f"{digest}.png")
+        return path if os.path.exists(path) else None
+
+    def put(self, job_id: str, image_bytes: bytes) -> str:
+        """Store image_bytes for job_id and return the image path."""
+        digest = hashlib.sha256(image_bytes).hexdigest()
+        path = os.path.join(self.root, f"{digest}.png")
+        if not os.path.exists(path):
+            _write_atomic(path, image_bytes)
+        _write_atomic(os.path.join(self.root, "jobs", job_id), digest.encode("ascii"))
+        return path
+
+
+def _write_atomic(path: str, data: bytes):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class VisualJob:
+    """Handle for one queued image. Poll `status` or wait with result()/await wait()."""
+
+    def __init__(self, job_id: str, prompt: str, future: Future, cached: bool = False):
+        self.job_id = job_id
+        self.prompt = prompt
+        self.future = future
+        self.cached = cached
+
+    @property
+    def status(self) -> str:
+        if not self.future.done():
+            return "running" if self.future.running() else "queued"
+        return "failed" if self.future.exception() is not None else "done"
+
+    @property
+    def path(self) -> Optional[str]:
+        """Image path once the job is done, else None."""
+        if self.future.done() and self.future.exception() is None:
+            return self.future.result()
+        return None
+
+    def result(self, timeout: Optional[float] = None) -> str:
+        """Block until the image is stored and return its path. Re-raises generation errors."""
+        return self.future.result(timeout)
+
+    async def wait(self, timeout: Optional[float] = None) -> str:
+        """Async variant of result(). Cancelling the wait does not cancel the shared job."""
+        return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(self.future)), timeout)
+
+    def to_dict(self) -> Dict:
+        record = {"job_id": self.job_id, "status": self.status, "cached": self.cached, "path": self.path}
+        if self.status == "failed":
+            error = self.future.exception()
+            record["error"] = f"{type(error).__name__}: {error}"
+        return record
+
+
+class VisualQueue:
+    """Bounded worker pool that generates images in the background and dedupes by prompt.
+
+    `generator` is called as generator(prompt) on a worker thread and must
+    return the PNG bytes of one image. Only in-flight jobs (and the last
+    MAX_FAILED_JOBS failures) are held in memory; finished ones are served
+    from the image store.
+    """
+
+    def __init__(
+        self,
+        generator: Callable[[str], bytes],
+        store: Optional[ImageStore] = None,
+        max_workers: int = 2,
+        model: str = DEFAULT_IMAGE_MODEL,
+    ):
+        self.generator = generator
+        self.store = store if store is not None else ImageStore()
+        self.model = model
+        self.generated = 0
+        self.store_hits = 0
+        self.deduplicated = 0
+        self.failed = 0
+        self._jobs: Dict[str, VisualJob] = {}
+        self._failed: "OrderedDict[str, VisualJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="visual")
+
+    def submit(self, prompt: str) -> VisualJob:
+        """Queue an image for prompt and return its handle without waiting."""
+        job_id = visual_job_id(prompt, self.model)
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                self.deduplicated += 1
+                return job
+            path = self.store.lookup(job_id)
+            if path is not None:
+                self.store_hits += 1
+                return VisualJob(job_id, prompt, _done(path), cached=True)
+            self._failed.pop(job_id, None)
+            job = VisualJob(job_id, prompt, self._executor.submit(self._generate, job_id, prompt))
+            self._jobs[job_id] = job
+        # Outside the lock: the callback runs right here if the job already finished
+        job.future.add_done_callback(lambda _, job=job: self._finish(job))
+        return job
+
+    def _finish(self, job: VisualJob):
+        with self._lock:
+            if self._jobs.get(job.job_id) is job:
+                del self._jobs[job.job_id]
+            if job.status == "failed":
+                self._failed[job.job_id] = job
+                while len(self._failed) > MAX_FAILED_JOBS:
+                    self._failed.popitem(last=False)
+
+    def get(self, job_id: str) -> Optional[VisualJob]:
+        """Look up an in-flight or recently failed job by id, falling back to the image store for finished ones."""
+        with self._lock:
+            job = self._jobs.get(job_id) or self._failed.get(job_id)
+        if job is not None:
+            return job
+        path = self.store.lookup(job_id)
+        return VisualJob(job_id, "", _done(path), cached=True) if path is not None else None
+
+    def _generate(self, job_id: str, prompt: str) -> str:
+        try:
+            path = self.store.put(job_id, self.generator(prompt))
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        with self._lock:
+            self.generated += 1
+        return path
+
+    def stats(self) -> Dict:
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+            return {
+                "queued": statuses.count("queued"),
+                "running": statuses.count("running"),
+                "generated": self.generated,
+                "store_hits": self.store_hits,
+                "deduplicated": self.deduplicated,
+                "failed": self.failed,
+            }
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+def _done(path: str) -> Future:
+    future: Future = Future()
+    future.set_result(path)
+    return future
+
+
+@contextmanager
+def collect_visual_jobs():
+    """Collect the jobs queued by tools running in the current context (thread / asyncio task)."""
+    jobs: List[VisualJob] = []
+    token = current_visual_jobs.set(jobs)
+    try:
+        yield jobs
+    finally:
+        current_visual_jobs.reset(token)
+
+
+def imagen_generator(client: "Client", model: str = DEFAULT_IMAGE_MODEL) -> Callable[[str], bytes]:
+    """Generator for VisualQueue backed by Imagen through a google-genai client."""
+
+    def generate(prompt: str) -> bytes:
+        response = client.models.generate_images(model=model, prompt=prompt)
+        for generated_image in response.generated_images or []:
+            if generated_image.image is not None and generated_image.image.image_bytes:
+                return generated_image.image.image_bytes
+        raise RuntimeError("No images were generated")
+
+    return generate